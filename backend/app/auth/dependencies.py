@@ -1,20 +1,21 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
-from ..core.database import get_db
-from ..crud.user import get_user_by_id
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..core.database import get_async_db
+from ..crud.aio.user import get_user_by_id
 from .jwt import verify_access_token
+from .user_cache import user_cache, UserPrincipal
 
 security = HTTPBearer()
 
-def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security), db: Session = Depends(get_db)):
+async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security), db: AsyncSession = Depends(get_async_db)):
     """
     Get the current authenticated user from JWT token.
     Args:
         credentials: JWT token from Authorization header
-        db: Database session
+        db: Async database session
     Returns:
-        User: The authenticated user object
+        UserPrincipal: Cached snapshot of the authenticated user
     Raises:
         HTTPException: If token is invalid or user not found
     """
@@ -36,12 +37,25 @@ def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(securit
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    user = get_user_by_id(db, int(user_id))
-    if user is None:
+    # A cached entry older than the token is stale and reloaded from the database
+    token_version = int(payload.get("ver", 0))
+    principal = user_cache.get(int(user_id), min_version=token_version)
+    if principal is None:
+        user = await get_user_by_id(db, int(user_id))
+        if user is None:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="User not found",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+        principal = UserPrincipal(user)
+        user_cache.put(principal)
+    
+    # A token older than the user was issued before a change (e.g. a demotion)
+    if token_version < principal.token_version:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="User not found",
+            detail="Token has been revoked",
             headers={"WWW-Authenticate": "Bearer"},
         )
-    
-    return user 
\ No newline at end of file
+    return principal 
\ No newline at end of file
@@ -34,4 +34,14 @@ def verify_access_token(token: str) -> Optional[dict]:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         return payload
     except JWTError:
-        return None 
\ No newline at end of file
+        return None 
+
+def create_user_access_token(user) -> str:
+    """
+    Create an access token for a user, carrying its role and token version.
+    Args:
+        user: The User object to issue the token for.
+    Returns:
+        str: Encoded JWT token.
+    """
+    return create_access_token({"sub": str(user.id), "role": user.role, "ver": user.token_version or 0})
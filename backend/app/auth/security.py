@@ -1,7 +1,103 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from passlib.context import CryptContext
+from ..core.config import settings
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# bcrypt releases the GIL, so a small dedicated thread pool runs hashes in
+# parallel without occupying the request worker threads' CPU share. Work
+# beyond the pool size plus the queue limit is rejected instead of queued.
+_executor = ThreadPoolExecutor(max_workers=settings.PASSWORD_HASH_WORKERS, thread_name_prefix="password-hash")
+_max_in_flight = settings.PASSWORD_HASH_WORKERS + settings.PASSWORD_HASH_QUEUE_LIMIT
+_lock = threading.Lock()
+_in_flight = 0
+_stats = {
+    "completed": 0,
+    "rejected": 0,
+    "queue_wait_seconds_total": 0.0,
+    "queue_wait_seconds_max": 0.0,
+    "hash_seconds_total": 0.0,
+    "hash_seconds_max": 0.0,
+}
+
+
+class HashingOverloadedError(RuntimeError):
+    """
+    Raised when the password hashing queue is full; maps to 503 with Retry-After.
+    """
+    retry_after = settings.PASSWORD_HASH_RETRY_AFTER_SECONDS
+
+
+def _admit() -> None:
+    global _in_flight
+    with _lock:
+        if _in_flight >= _max_in_flight:
+            _stats["rejected"] += 1
+            raise HashingOverloadedError("Too many concurrent login requests, please retry shortly")
+        _in_flight += 1
+
+def _release() -> None:
+    global _in_flight
+    with _lock:
+        _in_flight -= 1
+
+def _timed(fn, *args):
+    """
+    Wrap a hashing call so it records its queue wait and run time.
+    """
+    submitted = time.perf_counter()
+
+    def task():
+        started = time.perf_counter()
+        try:
+            return fn(*args)
+        finally:
+            finished = time.perf_counter()
+            with _lock:
+                wait, elapsed = started - submitted, finished - started
+                _stats["completed"] += 1
+                _stats["queue_wait_seconds_total"] += wait
+                _stats["queue_wait_seconds_max"] = max(_stats["queue_wait_seconds_max"], wait)
+                _stats["hash_seconds_total"] += elapsed
+                _stats["hash_seconds_max"] = max(_stats["hash_seconds_max"], elapsed)
+    return task
+
+def _submit(fn, *args) -> Future:
+    """
+    Admit a hashing job and submit it to the dedicated pool. Its admission
+    slot is released when the job is done, not when the caller stops
+    waiting, so a cancelled request cannot hide a job that is still running.
+    Raises:
+        HashingOverloadedError: If the pool and its queue are full
+    """
+    _admit()
+    try:
+        future = _executor.submit(_timed(fn, *args))
+    except BaseException:
+        _release()
+        raise
+    future.add_done_callback(lambda _: _release())
+    return future
+
+def _run_in_pool(fn, *args):
+    """
+    Run a hashing function on the dedicated pool and wait for its result.
+    Raises:
+        HashingOverloadedError: If the pool and its queue are full
+    """
+    return _submit(fn, *args).result()
+
+async def _run_in_pool_async(fn, *args):
+    """
+    Await a hashing function on the dedicated pool without blocking the event loop.
+    Raises:
+        HashingOverloadedError: If the pool and its queue are full
+    """
+    return await asyncio.wrap_future(_submit(fn, *args))
+
 def hash_password(password: str) -> str:
     """
     Hash a plain password using bcrypt.
@@ -9,8 +105,10 @@ def hash_password(password: str) -> str:
         password (str): The plain password to hash.
     Returns:
         str: The hashed password.
+    Raises:
+        HashingOverloadedError: If the hashing pool is saturated.
     """
-    return pwd_context.hash(password)
+    return _run_in_pool(pwd_context.hash, password)
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """
@@ -20,5 +118,34 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
         hashed_password (str): The hashed password to check against.
     Returns:
         bool: True if the password matches, False otherwise.
+    Raises:
+        HashingOverloadedError: If the hashing pool is saturated.
+    """
+    return _run_in_pool(pwd_context.verify, plain_password, hashed_password)
+
+async def ahash_password(password: str) -> str:
+    """
+    Async variant of hash_password for routes running on the event loop.
+    """
+    return await _run_in_pool_async(pwd_context.hash, password)
+
+async def averify_password(plain_password: str, hashed_password: str) -> bool:
+    """
+    Async variant of verify_password for routes running on the event loop.
+    """
+    return await _run_in_pool_async(pwd_context.verify, plain_password, hashed_password)
+
+def hashing_stats() -> dict:
+    """
+    Snapshot of the hashing pool metrics.
     """
-    return pwd_context.verify(plain_password, hashed_password) 
\ No newline at end of file
+    with _lock:
+        completed = _stats["completed"] or 1
+        return {
+            **_stats,
+            "in_flight": _in_flight,
+            "max_in_flight": _max_in_flight,
+            "workers": settings.PASSWORD_HASH_WORKERS,
+            "queue_wait_seconds_avg": _stats["queue_wait_seconds_total"] / completed,
+            "hash_seconds_avg": _stats["hash_seconds_total"] / completed,
+        }
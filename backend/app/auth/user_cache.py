@@ -0,0 +1,88 @@
+"""
+Bounded in-process cache of authenticated user principals.
+
+`get_current_user` resolves the token's user id through this cache instead
+of querying the database on every request. Entries expire after a TTL, the
+least recently used entry is evicted when the cache is full, and
+`crud.user` invalidates entries when a user is updated or deleted.
+
+Updates also bump the user's `token_version`, and tokens carrying an older
+`ver` claim are rejected. Invalidation only reaches the process that made
+the change: another worker keeps serving its cached principal, and accepting
+the old token, until the entry expires, so cross-process staleness is
+bounded by USER_CACHE_TTL_SECONDS.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from ..core.config import settings
+
+
+class UserPrincipal:
+    """
+    Immutable snapshot of the user fields needed by the routes.
+    Fields mirror the User model (without the password hash).
+    """
+    __slots__ = ("id", "name", "email", "phone_number", "age", "gender", "role", "token_version")
+
+    def __init__(self, user):
+        self.id = user.id
+        self.name = user.name
+        self.email = user.email
+        self.phone_number = user.phone_number
+        self.age = user.age
+        self.gender = user.gender
+        self.role = user.role
+        self.token_version = user.token_version or 0
+
+
+class UserCache:
+    """
+    Thread-safe TTL + LRU cache of UserPrincipal objects keyed by user id.
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: float):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[int, tuple[float, UserPrincipal]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, user_id: int, min_version: int = 0) -> UserPrincipal | None:
+        """
+        Get a cached principal, or None if missing, expired or older than min_version.
+        """
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None or entry[0] < time.monotonic() or entry[1].token_version < min_version:
+                if entry is not None:
+                    del self._entries[user_id]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(user_id)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, principal: UserPrincipal) -> None:
+        with self._lock:
+            self._entries[principal.id] = (time.monotonic() + self.ttl_seconds, principal)
+            self._entries.move_to_end(principal.id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: int) -> None:
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"size": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+user_cache = UserCache(settings.USER_CACHE_SIZE, settings.USER_CACHE_TTL_SECONDS)
@@ -1,14 +1,43 @@
+import time
+from fastapi import Request
 from sqlalchemy import create_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from .config import settings
+from .db_pool import engine_options, instrument_engine
 
 # Create SQLAlchemy engine
-engine = create_engine(settings.DATABASE_URL)
+engine = instrument_engine(create_engine(settings.DATABASE_URL, **engine_options(settings.DATABASE_URL)))
 
 # Create SessionLocal class
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async engine and sessions for routes that run on the event loop
+async_engine = instrument_engine(
+    create_async_engine(settings.ASYNC_DATABASE_URL, **engine_options(settings.ASYNC_DATABASE_URL, is_async=True))
+)
+AsyncSessionLocal = async_sessionmaker(async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+
+# Read replica for read-only routes; without REPLICA_DATABASE_URL it is the primary
+if settings.REPLICA_DATABASE_URL:
+    replica_engine = instrument_engine(
+        create_engine(settings.REPLICA_DATABASE_URL, **engine_options(settings.REPLICA_DATABASE_URL))
+    )
+    async_replica_engine = instrument_engine(
+        create_async_engine(settings.ASYNC_REPLICA_DATABASE_URL, **engine_options(settings.ASYNC_REPLICA_DATABASE_URL, is_async=True))
+    )
+else:
+    replica_engine, async_replica_engine = engine, async_engine
+ReplicaSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=replica_engine)
+AsyncReplicaSessionLocal = async_sessionmaker(async_replica_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+
+# Set after a client's write; holds the unix time until which it reads from the
+# primary. The header is for cross-origin clients (the SPA echoes it back on
+# its requests), the cookie for same-origin ones.
+PRIMARY_PIN_HEADER = "X-Primary-Pin"
+PRIMARY_PIN_COOKIE = "primary_pin"
+
 # Create Base class
 Base = declarative_base()
 
@@ -21,4 +50,41 @@ def get_db():
     try:
         yield db
     finally:
-        db.close() 
\ No newline at end of file
+        db.close()
+
+async def get_async_db():
+    """
+    Dependency to get an async database session.
+    Yields an AsyncSession and ensures it's closed after use.
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
+
+def pinned_to_primary(request: Request) -> bool:
+    """
+    Whether the client wrote recently enough that it must read its own write.
+    Pins further ahead than PRIMARY_PIN_SECONDS are ignored, so a client
+    cannot keep itself on the primary.
+    """
+    pin = request.headers.get(PRIMARY_PIN_HEADER) or request.cookies.get(PRIMARY_PIN_COOKIE, "")
+    now = time.time()
+    return pin.isdigit() and now < int(pin) <= now + settings.PRIMARY_PIN_SECONDS + 1
+
+def get_read_db(request: Request):
+    """
+    Dependency for read-only routes.
+    Yields a replica session, or a primary session when the client is pinned.
+    """
+    db = SessionLocal() if pinned_to_primary(request) else ReplicaSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+async def get_async_read_db(request: Request):
+    """
+    Async variant of get_read_db.
+    """
+    factory = AsyncSessionLocal if pinned_to_primary(request) else AsyncReplicaSessionLocal
+    async with factory() as db:
+        yield db
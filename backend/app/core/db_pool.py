@@ -0,0 +1,140 @@
+"""
+Connection pool configuration and instrumentation for the database engines.
+
+Each engine gets its own pool subclass carrying a PoolMetrics instance, so
+the counters survive engine.dispose() (which recreates the pool from its
+class) and the sync and async engines are reported separately.
+Usage: instrument_engine(create_engine(url, **engine_options(url)))
+"""
+
+import threading
+import time
+from uuid import uuid4
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool, AsyncAdaptedQueuePool, NullPool
+from .config import settings
+
+
+class PoolMetrics:
+    """
+    Thread-safe counters for one engine's connection pool.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = {
+            "connects": 0,
+            "checkouts": 0,
+            "checkins": 0,
+            "invalidations": 0,
+            "timeouts": 0,
+            "wait_seconds_total": 0.0,
+            "wait_seconds_max": 0.0,
+        }
+
+    def incr(self, name: str) -> None:
+        with self._lock:
+            self._counters[name] += 1
+
+    def record_wait(self, seconds: float, timed_out: bool = False) -> None:
+        with self._lock:
+            if timed_out:
+                self._counters["timeouts"] += 1
+            self._counters["wait_seconds_total"] += seconds
+            self._counters["wait_seconds_max"] = max(self._counters["wait_seconds_max"], seconds)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            counters = dict(self._counters)
+        counters["wait_seconds_avg"] = counters["wait_seconds_total"] / (counters["checkouts"] or 1)
+        return counters
+
+
+class _InstrumentedPool:
+    """
+    Pool mixin timing how long each checkout waits for a connection.
+    """
+    metrics: PoolMetrics
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            self.metrics.record_wait(time.perf_counter() - started, timed_out=True)
+            raise
+        self.metrics.record_wait(time.perf_counter() - started)
+        return connection
+
+
+def _instrumented_pool_class(base: type) -> type:
+    return type(f"Instrumented{base.__name__}", (_InstrumentedPool, base), {"metrics": PoolMetrics()})
+
+def engine_options(url: str, is_async: bool = False) -> dict:
+    """
+    Build create_engine keyword arguments from the pool settings.
+    A DB_POOL_SIZE of 0 disables client-side pooling (NullPool), which is the
+    usual setup when an external pooler such as pgbouncer sits in front of
+    Postgres. DB_PGBOUNCER makes the connections safe for transaction pooling
+    by keeping no named server-side prepared statements across transactions.
+    Args:
+        url (str): Database URL the engine is created for
+        is_async (bool): Whether the options are for the async engine
+    Returns:
+        dict: Keyword arguments for create_engine / create_async_engine
+    """
+    if settings.DB_POOL_SIZE <= 0:
+        base = NullPool
+    else:
+        base = AsyncAdaptedQueuePool if is_async else QueuePool
+    options = {
+        "poolclass": _instrumented_pool_class(base),
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+    if base is not NullPool:
+        options.update(
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+            pool_recycle=settings.DB_POOL_RECYCLE,
+        )
+    # psycopg2 never prepares statements server-side; asyncpg does by default
+    if settings.DB_PGBOUNCER and url.startswith("postgresql+asyncpg"):
+        options["connect_args"] = {
+            "statement_cache_size": 0,
+            "prepared_statement_cache_size": 0,
+            "prepared_statement_name_func": lambda: f"__asyncpg_{uuid4()}__",
+        }
+    return options
+
+def instrument_engine(engine):
+    """
+    Count connects, checkouts, checkins and invalidations of an engine's pool.
+    Listeners registered on the engine carry over to pools recreated by dispose().
+    Returns:
+        The engine, for chaining at creation time
+    """
+    sync_engine = getattr(engine, "sync_engine", engine)
+    metrics = sync_engine.pool.metrics
+    event.listen(sync_engine, "connect", lambda *args: metrics.incr("connects"))
+    event.listen(sync_engine, "checkout", lambda *args: metrics.incr("checkouts"))
+    event.listen(sync_engine, "checkin", lambda *args: metrics.incr("checkins"))
+    event.listen(sync_engine, "invalidate", lambda *args: metrics.incr("invalidations"))
+    return engine
+
+def pool_stats(engine) -> dict:
+    """
+    Snapshot of an engine's pool: live occupancy plus cumulative counters.
+    """
+    pool = getattr(engine, "sync_engine", engine).pool
+    stats = {"pool": type(pool).__name__, **pool.metrics.snapshot()}
+    if isinstance(pool, QueuePool):
+        stats.update(
+            size=pool.size(),
+            checked_out=pool.checkedout(),
+            checked_in=pool.checkedin(),
+            overflow=max(pool.overflow(), 0),
+            max_overflow=settings.DB_MAX_OVERFLOW,
+        )
+    return stats
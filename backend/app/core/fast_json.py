@@ -0,0 +1,78 @@
+"""
+Fast JSON responses for read endpoints that return many trusted rows.
+
+Returning a list of Pydantic models makes FastAPI validate every item (and
+every nested model) against the route's response_model again and then
+encode the result with the stdlib json module. Routes that build plain
+dicts from database rows they trust can return `fast_json_response(rows)`
+instead: the rows are encoded straight to bytes with orjson and FastAPI
+skips response validation because a Response is returned. The route keeps
+its `response_model`, so the OpenAPI schema is unchanged; the row builders
+must produce exactly that shape. orjson is optional (stdlib json is used
+without it) and FAST_JSON_RESPONSES=false switches the routes back to the
+validated path.
+"""
+
+import json
+from typing import Any, Mapping
+from fastapi import Response
+from .config import settings
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+
+def dumps(content: Any) -> bytes:
+    """
+    Encode JSON-native content (plus dates and datetimes) to compact bytes.
+    """
+    if orjson is not None:
+        return orjson.dumps(content)
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":"), default=_isoformat).encode("utf-8")
+
+def _isoformat(value):
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class FastJSONResponse(Response):
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def fast_json_response(content: Any, headers: Mapping[str, str] | None = None) -> FastJSONResponse:
+    """
+    Respond with pre-shaped content, bypassing response_model validation.
+    Args:
+        content: Dicts/lists matching the route's response_model
+        headers: Extra response headers (a route's injected Response is not merged)
+    """
+    return FastJSONResponse(content, headers=dict(headers) if headers else None)
+
+def list_response(items, row, model, headers: Mapping[str, str] | None = None):
+    """
+    Respond with a list of rows, through the fast path when it is enabled.
+    Args:
+        items: Objects to return
+        row: Builds the plain dict of an item (e.g. BookingOut.row)
+        model: Builds the validated model of an item (e.g. BookingOut.from_booking)
+        headers: Headers for the fast path; on the validated path the route
+            sets them on its injected Response
+    """
+    if settings.FAST_JSON_RESPONSES:
+        return fast_json_response([row(item) for item in items], headers)
+    return [model(item) for item in items]
+
+def page_response(items, next_cursor: str | None, row, model, headers: Mapping[str, str] | None = None):
+    """
+    Respond with one page of a list as {"items": [...], "next_cursor": ...},
+    through the fast path when it is enabled. Arguments as for list_response.
+    """
+    if settings.FAST_JSON_RESPONSES:
+        return fast_json_response({"items": [row(item) for item in items], "next_cursor": next_cursor}, headers)
+    return {"items": [model(item) for item in items], "next_cursor": next_cursor}
@@ -0,0 +1,90 @@
+"""
+Resized WebP and JPEG variants of uploaded slider images.
+
+Each upload is decoded once and resized to the IMAGE_BREAKPOINTS widths
+(never upscaled). Variants are written to DERIVATIVE_DIR under names
+derived from the SHA-256 of the original bytes, e.g.
+`3f9a...c2-960w.webp`, so a name always denotes the same content and the
+files can be cached by browsers forever (see core/static_files.py).
+Pillow is optional: without it uploads are stored without variants.
+"""
+
+import os
+from .config import settings
+from .image_storage import static_url, content_hash
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:  # pragma: no cover - optional dependency
+    Image = None
+
+WEBP_QUALITY = 80
+JPEG_QUALITY = 82
+
+
+class InvalidImageError(ValueError):
+    """
+    Raised when an upload cannot be decoded as an image; it is not retried.
+    """
+
+
+def derivatives_enabled() -> bool:
+    return Image is not None and bool(settings.IMAGE_BREAKPOINTS)
+
+def _widths(original_width: int) -> list[int]:
+    widths = sorted({w for w in settings.IMAGE_BREAKPOINTS if w < original_width})
+    # Always include the original width when it is below the largest breakpoint
+    if not widths or original_width <= max(settings.IMAGE_BREAKPOINTS):
+        widths.append(original_width)
+    return widths
+
+def _save(image, path: str, fmt: str) -> None:
+    tmp = path + ".tmp"
+    if fmt == "WEBP":
+        image.save(tmp, "WEBP", quality=WEBP_QUALITY, method=4)
+    else:
+        if image.mode != "RGB":
+            # JPEG has no alpha channel; flatten onto white
+            background = Image.new("RGB", image.size, (255, 255, 255))
+            background.paste(image, mask=image.getchannel("A") if "A" in image.getbands() else None)
+            image = background
+        image.save(tmp, "JPEG", quality=JPEG_QUALITY, optimize=True, progressive=True)
+    os.replace(tmp, path)
+
+def build_derivatives(path: str, name: str | None = None) -> dict[str, str] | None:
+    """
+    Write the WebP and JPEG variants of an image, reusing existing ones.
+    Args:
+        path (str): Original image file
+        name (str | None): Content hash of the file, if already known
+    Returns:
+        dict | None: {"srcset": webp srcset, "srcset_jpeg": jpeg srcset},
+        or None when derivatives are disabled
+    Raises:
+        InvalidImageError: If the file is not a decodable image
+    """
+    if not derivatives_enabled():
+        return None
+    name = name or content_hash(path)
+    os.makedirs(settings.DERIVATIVE_DIR, exist_ok=True)
+    try:
+        original = Image.open(path)
+        original.load()
+    except (OSError, Image.DecompressionBombError) as e:
+        raise InvalidImageError(f"Cannot process image: {e}") from e
+    with original:
+        image = ImageOps.exif_transpose(original)
+        if image.mode not in ("RGB", "RGBA"):
+            image = image.convert("RGBA" if "transparency" in image.info or image.mode in ("LA", "PA") else "RGB")
+        srcsets = {"srcset": [], "srcset_jpeg": []}
+        for width in _widths(image.width):
+            resized = None
+            for key, fmt, ext in (("srcset", "WEBP", "webp"), ("srcset_jpeg", "JPEG", "jpg")):
+                target = os.path.join(settings.DERIVATIVE_DIR, f"{name}-{width}w.{ext}")
+                if not os.path.exists(target):
+                    if resized is None:
+                        height = max(1, round(image.height * width / image.width))
+                        resized = image if width == image.width else image.resize((width, height), Image.LANCZOS)
+                    _save(resized, target, fmt)
+                srcsets[key].append(f"{static_url(target)} {width}w")
+    return {key: ", ".join(entries) for key, entries in srcsets.items()}
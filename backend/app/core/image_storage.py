@@ -0,0 +1,149 @@
+"""
+Pluggable storage for uploaded slider images.
+
+Uploads are first staged under UPLOAD_DIR by the request that receives them,
+copied chunk by chunk so memory stays at one small buffer however large the
+upload: the size cap is enforced as bytes arrive, the type is sniffed from
+the magic bytes instead of the client's Content-Type, and the content hash
+is computed on the way. The upload worker then hands the staged file to the
+configured backend. `CloudinaryImageBackend` pushes it to Cloudinary,
+`LocalImageBackend` moves it into a static directory and serves it from
+there (for tests and offline deployments). Backends are blocking and run on
+a worker thread.
+"""
+
+import hashlib
+import os
+import shutil
+import uuid
+from typing import BinaryIO
+from .config import settings
+
+STATIC_DIR = "static"
+STATIC_URL = "/static"
+
+# Leading bytes of the accepted image formats, and their file extensions
+IMAGE_SIGNATURES = ((b"\xff\xd8\xff", ".jpg"), (b"\x89PNG\r\n\x1a\n", ".png"))
+
+# Hex digits of the SHA-256 kept in content-addressed file names
+HASH_LENGTH = 20
+
+
+class ImageUploadError(Exception):
+    """
+    Raised by a backend when a file could not be stored; the upload is retried.
+    """
+
+
+class UploadRejectedError(ValueError):
+    """
+    Raised while staging an upload that is not an accepted image or is too large.
+    """
+
+    def __init__(self, message: str, status_code: int = 400):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+def static_url(path: str) -> str:
+    """
+    Public URL of a file under the static directory.
+    Raises:
+        ValueError: If the path is outside the static directory
+    """
+    relative = os.path.relpath(path, STATIC_DIR)
+    if relative.startswith(os.pardir):
+        raise ValueError(f"{path} is not under the '{STATIC_DIR}' directory")
+    return STATIC_URL + "/" + relative.replace(os.sep, "/")
+
+def sniff_image_extension(header: bytes) -> str | None:
+    """
+    File extension of an accepted image format, from the file's first bytes.
+    """
+    for signature, extension in IMAGE_SIGNATURES:
+        if header.startswith(signature):
+            return extension
+    return None
+
+def content_hash(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(settings.UPLOAD_CHUNK_BYTES), b""):
+            digest.update(chunk)
+    return digest.hexdigest()[:HASH_LENGTH]
+
+def stage_upload(source: BinaryIO, max_bytes: int) -> tuple[str, str]:
+    """
+    Copy an upload stream to UPLOAD_DIR under a unique name, chunk by chunk.
+    Args:
+        source (BinaryIO): Upload stream, read from its current position
+        max_bytes (int): Size cap; the copy stops as soon as it is exceeded
+    Returns:
+        tuple[str, str]: (path of the staged file, content hash)
+    Raises:
+        UploadRejectedError: If the stream is not a JPEG/PNG image (400)
+            or is larger than max_bytes (413)
+    """
+    chunk = source.read(settings.UPLOAD_CHUNK_BYTES)
+    extension = sniff_image_extension(chunk)
+    if extension is None:
+        raise UploadRejectedError("Only JPG and PNG images are allowed.")
+    os.makedirs(settings.UPLOAD_DIR, exist_ok=True)
+    path = os.path.join(settings.UPLOAD_DIR, uuid.uuid4().hex + extension)
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        with open(path, "wb") as f:
+            while chunk:
+                size += len(chunk)
+                if size > max_bytes:
+                    raise UploadRejectedError(f"Image size must be less than {max_bytes // (1024 * 1024)}MB.", 413)
+                digest.update(chunk)
+                f.write(chunk)
+                chunk = source.read(settings.UPLOAD_CHUNK_BYTES)
+    except BaseException:
+        os.remove(path)
+        raise
+    return path, digest.hexdigest()[:HASH_LENGTH]
+
+
+class LocalImageBackend:
+    """
+    Serve images from a directory under the static mount.
+    """
+    name = "local"
+
+    def __init__(self, directory: str):
+        static_url(os.path.join(directory, "_"))
+        self.directory = directory
+
+    def upload(self, path: str) -> str:
+        os.makedirs(self.directory, exist_ok=True)
+        target = os.path.join(self.directory, os.path.basename(path))
+        try:
+            shutil.move(path, target)
+        except OSError as e:
+            raise ImageUploadError(str(e)) from e
+        return static_url(target)
+
+
+class CloudinaryImageBackend:
+    """
+    Push images to Cloudinary.
+    """
+    name = "cloudinary"
+
+    def upload(self, path: str) -> str:
+        from ..cloudinary_utils import upload_image_to_cloudinary
+        url = upload_image_to_cloudinary(path)
+        if not url:
+            raise ImageUploadError("Cloudinary upload failed")
+        return url
+
+
+def get_image_backend():
+    if settings.IMAGE_BACKEND == "local":
+        return LocalImageBackend(settings.LOCAL_IMAGE_DIR)
+    if settings.IMAGE_BACKEND == "cloudinary":
+        return CloudinaryImageBackend()
+    raise ValueError(f"Unknown IMAGE_BACKEND '{settings.IMAGE_BACKEND}'")
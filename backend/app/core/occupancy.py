@@ -0,0 +1,90 @@
+"""
+In-process index of per-day occupancy bitmaps.
+
+For each date the index keeps an integer whose bit i is set when slot i of
+that date's schedule template is booked (see slot_engine.booked_mask). A
+"next free slot" search scans these masks day by day; days missing from the
+index are loaded in bulk with one booking query per range. The booking write
+paths invalidate the dates they touch, the entries are tied to the compiled
+Schedule they were computed for, and a TTL bounds staleness across worker
+processes (the booking insert itself still rejects conflicts).
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from datetime import date
+from .config import settings
+from .slot_engine import Schedule
+
+
+class OccupancyIndex:
+    """
+    Thread-safe TTL + LRU map of date -> booked-slot bitmap.
+    """
+
+    def __init__(self, max_days: int, ttl_seconds: float):
+        self.max_days = max_days
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._epoch = 0
+        self._versions: dict[date, int] = {}
+        self._entries: OrderedDict[date, tuple[float, Schedule, int]] = OrderedDict()
+        self.hits = 0
+        self.loads = 0
+
+    def lookup(self, schedule: Schedule, dates: list[date]) -> tuple[dict[date, int], list[date], tuple]:
+        """
+        Split dates into cached masks and dates that need loading.
+        Returns:
+            (masks, missing, token): token must be passed back to store()
+        """
+        masks, missing = {}, []
+        now = time.monotonic()
+        with self._lock:
+            for d in dates:
+                entry = self._entries.get(d)
+                if entry is not None and entry[1] is schedule and entry[0] > now:
+                    masks[d] = entry[2]
+                    self._entries.move_to_end(d)
+                else:
+                    missing.append(d)
+            self.hits += len(masks)
+            token = (self._epoch, {d: self._versions.get(d, 0) for d in missing})
+        return masks, missing, token
+
+    def store(self, schedule: Schedule, masks: dict[date, int], token: tuple) -> None:
+        """
+        Cache freshly loaded masks unless their dates were invalidated meanwhile.
+        """
+        epoch, versions = token
+        expires = time.monotonic() + self.ttl_seconds
+        with self._lock:
+            self.loads += len(masks)
+            if epoch != self._epoch:
+                return
+            for d, mask in masks.items():
+                if self._versions.get(d, 0) == versions.get(d):
+                    self._entries[d] = (expires, schedule, mask)
+                    self._entries.move_to_end(d)
+            while len(self._entries) > self.max_days:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, *dates: date) -> None:
+        with self._lock:
+            for d in dates:
+                self._versions[d] = self._versions.get(d, 0) + 1
+                self._entries.pop(d, None)
+
+    def invalidate_all(self) -> None:
+        with self._lock:
+            self._epoch += 1
+            self._versions.clear()
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"days": len(self._entries), "hits": self.hits, "loads": self.loads}
+
+
+occupancy_index = OccupancyIndex(settings.OCCUPANCY_INDEX_DAYS, settings.SLOT_CACHE_TTL_SECONDS)
@@ -0,0 +1,193 @@
+"""
+In-process cache for rarely changing public JSON responses.
+
+Responses are grouped into namespaces ("slider", "clinic_info",
+"availability"). Each namespace has a version that the admin write paths
+bump, which invalidates every cached body of that namespace at once. Bodies
+carry a strong ETag derived from their bytes, so identical content gets the
+same ETag in every worker and conditional requests are answered with 304.
+Entries also expire after RESPONSE_CACHE_TTL_SECONDS, which bounds how long
+another worker process can serve content from before a write. At most
+RESPONSE_CACHE_MAX_ENTRIES bodies are kept; the least recently used one is
+evicted first. Paginated lists are cached whole under one key and sliced per
+request (see respond_slice), so client-chosen offsets do not add entries.
+"""
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Hashable
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+from .config import settings
+
+CACHE_SLIDER = "slider"
+CACHE_CLINIC_INFO = "clinic_info"
+CACHE_AVAILABILITY = "availability"
+
+PUBLIC_CACHE_CONTROL = f"public, max-age={settings.PUBLIC_CACHE_MAX_AGE_SECONDS}, must-revalidate"
+PRIVATE_CACHE_CONTROL = "private, no-cache"
+
+
+def serialize(content: Any) -> bytes:
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+class CachedBody:
+    __slots__ = ("version", "content", "body", "etag", "stored_at")
+
+    def __init__(self, version: int, content: Any, body: bytes):
+        self.version = version
+        self.content = content
+        self.body = body
+        self.etag = '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+        self.stored_at = time.monotonic()
+
+
+class ResponseCache:
+    """
+    Versioned cache of serialized response bodies, bounded by an LRU.
+    """
+
+    def __init__(self, ttl_seconds: float, max_entries: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._versions: dict[str, int] = {}
+        self._entries: OrderedDict[tuple[str, Hashable], CachedBody] = OrderedDict()
+        self._stats = {"hits": 0, "misses": 0, "not_modified": 0, "invalidations": 0, "evictions": 0}
+
+    def version(self, namespace: str) -> int:
+        return self._versions.get(namespace, 0)
+
+    def bump(self, namespace: str) -> None:
+        """
+        Invalidate every cached response of a namespace.
+        """
+        with self._lock:
+            self._versions[namespace] = self._versions.get(namespace, 0) + 1
+            self._stats["invalidations"] += 1
+
+    def _is_live(self, namespace: str, entry: CachedBody, now: float) -> bool:
+        return entry.version == self._versions.get(namespace, 0) and now - entry.stored_at <= self.ttl_seconds
+
+    def get(self, namespace: str, key: Hashable) -> CachedBody | None:
+        with self._lock:
+            entry = self._entries.get((namespace, key))
+            if entry is None or not self._is_live(namespace, entry, time.monotonic()):
+                self._stats["misses"] += 1
+                return None
+            self._entries.move_to_end((namespace, key))
+            self._stats["hits"] += 1
+            return entry
+
+    def store(self, namespace: str, key: Hashable, version: int, content: Any) -> CachedBody:
+        """
+        Serialize and cache content rendered while the namespace was at `version`.
+        If a write bumped the version meanwhile, the entry is simply never hit.
+        Expired and outdated entries are dropped first, then the least
+        recently used ones while the cache is over max_entries.
+        """
+        content = jsonable_encoder(content)
+        entry = CachedBody(version, content, serialize(content))
+        with self._lock:
+            self._entries[(namespace, key)] = entry
+            self._entries.move_to_end((namespace, key))
+            if len(self._entries) > self.max_entries:
+                now = time.monotonic()
+                for stale in [k for k, e in self._entries.items() if not self._is_live(k[0], e, now)]:
+                    del self._entries[stale]
+                    self._stats["evictions"] += 1
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._stats["evictions"] += 1
+        return entry
+
+    def respond(self, request: Request, entry: CachedBody, cache_control: str) -> Response:
+        """
+        Build a 200 or 304 response for a cached body.
+        """
+        headers = {"ETag": entry.etag, "Cache-Control": cache_control}
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match and (if_none_match.strip() == "*" or entry.etag in (t.strip() for t in if_none_match.split(","))):
+            with self._lock:
+                self._stats["not_modified"] += 1
+            return Response(status_code=304, headers=headers)
+        return Response(content=entry.body, media_type="application/json", headers=headers)
+
+    def respond_slice(self, request: Request, entry: CachedBody, start: int, stop: int, cache_control: str) -> Response:
+        """
+        Build a 200 or 304 response for a slice of a cached list body.
+        """
+        if start > 0 or stop < len(entry.content):
+            entry = CachedBody(entry.version, None, serialize(entry.content[start:stop]))
+        return self.respond(request, entry, cache_control)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                **self._stats,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "versions": dict(self._versions),
+            }
+
+
+response_cache = ResponseCache(settings.RESPONSE_CACHE_TTL_SECONDS, settings.RESPONSE_CACHE_MAX_ENTRIES)
+
+
+def cached_response(
+    request: Request,
+    namespace: str,
+    key: Hashable,
+    render: Callable[[], Any],
+    cache_control: str = PUBLIC_CACHE_CONTROL,
+) -> Response:
+    """
+    Serve a JSON response from the cache, rendering it on a miss.
+    Args:
+        request (Request): Incoming request, for If-None-Match
+        namespace (str): Cache namespace whose version admin writes bump
+        key: Key of the response within the namespace (e.g. query params)
+        render: Returns the response content; exceptions are not cached
+        cache_control (str): Cache-Control header value
+    Returns:
+        Response: 200 with the body, or 304 when the client's ETag matches
+    """
+    entry = response_cache.get(namespace, key)
+    if entry is None:
+        version = response_cache.version(namespace)
+        entry = response_cache.store(namespace, key, version, render())
+    return response_cache.respond(request, entry, cache_control)
+
+async def acached_list_slice(
+    request: Request,
+    namespace: str,
+    key: Hashable,
+    render: Callable[[], Awaitable[list]],
+    start: int,
+    stop: int,
+    cache_control: str = PUBLIC_CACHE_CONTROL,
+) -> Response:
+    """
+    Async variant of cached_response for paginated lists: the whole list is
+    cached under one key and items [start:stop] are served from it, so every
+    page shares a single cache entry.
+    Args:
+        request (Request): Incoming request, for If-None-Match
+        namespace (str): Cache namespace whose version admin writes bump
+        key: Key of the whole list within the namespace
+        render: Returns the whole list; exceptions are not cached
+        start (int): First item to return
+        stop (int): Item after the last one to return
+        cache_control (str): Cache-Control header value
+    Returns:
+        Response: 200 with the slice, or 304 when the client's ETag matches
+    """
+    entry = response_cache.get(namespace, key)
+    if entry is None:
+        version = response_cache.version(namespace)
+        entry = response_cache.store(namespace, key, version, await render())
+    return response_cache.respond_slice(request, entry, start, stop, cache_control)
@@ -0,0 +1,132 @@
+"""
+Per-date cache of computed slot lists with request coalescing.
+
+The booking write paths invalidate the dates they touch and an inventory
+rebuild invalidates every date. Concurrent misses for the same date share a
+single computation: the first request computes, the others await its result.
+Entries also expire after SLOT_CACHE_TTL_SECONDS, which bounds how long
+another worker process can serve a date from before a write; a stale "free"
+slot is harmless because the booking insert itself rejects conflicts.
+"""
+
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from datetime import date
+from typing import Awaitable, Callable
+from .config import settings
+
+SlotRow = tuple[int, int, str]
+
+
+class SlotCache:
+    """
+    Thread-safe TTL + LRU cache of slot lists keyed by date.
+    Each date has a version bumped by invalidate(); results computed under
+    an older version are handed to the requests already waiting for them but
+    never stored.
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: float):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._epoch = 0
+        self._versions: dict[date, int] = {}
+        self._entries: OrderedDict[date, tuple[float, tuple, tuple[SlotRow, ...]]] = OrderedDict()
+        self._pending: dict[tuple[date, tuple], asyncio.Future] = {}
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    def _version(self, target_date: date) -> tuple[int, int]:
+        return (self._epoch, self._versions.get(target_date, 0))
+
+    async def get_or_compute(
+        self,
+        target_date: date,
+        compute: Callable[[], Awaitable[list[SlotRow]]],
+    ) -> tuple[SlotRow, ...]:
+        """
+        Get the slots of a date, computing them once for all concurrent callers.
+        Args:
+            target_date (date): Date to look up
+            compute: Loads the (start, end, state) rows of the date
+        Returns:
+            tuple[SlotRow, ...]: The date's slots, shared between callers (do not mutate)
+        """
+        while True:
+            with self._lock:
+                version = self._version(target_date)
+                entry = self._entries.get(target_date)
+                if entry is not None and entry[1] == version and entry[0] > time.monotonic():
+                    self._entries.move_to_end(target_date)
+                    self.hits += 1
+                    return entry[2]
+                pending = self._pending.get((target_date, version))
+                if pending is None:
+                    self.misses += 1
+                    pending = asyncio.get_running_loop().create_future()
+                    self._pending[(target_date, version)] = pending
+                    break
+                self.coalesced += 1
+            try:
+                return await asyncio.shield(pending)
+            except asyncio.CancelledError:
+                if pending.cancelled():
+                    # The computing request went away; compute or join again
+                    continue
+                raise
+
+        try:
+            slots = tuple(await compute())
+        except BaseException as exc:
+            with self._lock:
+                self._pending.pop((target_date, version), None)
+            if isinstance(exc, asyncio.CancelledError):
+                pending.cancel()
+            else:
+                pending.set_exception(exc)
+                pending.exception()  # mark retrieved when nobody else was waiting
+            raise
+        with self._lock:
+            self._pending.pop((target_date, version), None)
+            if self._version(target_date) == version:
+                self._entries[target_date] = (time.monotonic() + self.ttl_seconds, version, slots)
+                self._entries.move_to_end(target_date)
+                while len(self._entries) > self.max_size:
+                    self._entries.popitem(last=False)
+        pending.set_result(slots)
+        return slots
+
+    def invalidate(self, *dates: date) -> None:
+        """
+        Drop the cached slots of the given dates.
+        """
+        with self._lock:
+            for d in dates:
+                self._versions[d] = self._versions.get(d, 0) + 1
+                self._entries.pop(d, None)
+
+    def invalidate_all(self) -> None:
+        """
+        Drop every cached date, e.g. after the slot inventory was rebuilt.
+        """
+        with self._lock:
+            self._epoch += 1
+            self._versions.clear()
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "in_flight": len(self._pending),
+                "hits": self.hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+            }
+
+
+slot_cache = SlotCache(settings.SLOT_CACHE_SIZE, settings.SLOT_CACHE_TTL_SECONDS)
@@ -0,0 +1,284 @@
+"""
+Slot engine shared by every availability and booking path.
+
+All computation happens in integer minutes since midnight. A weekly
+schedule is compiled once into per-weekday slot templates, so the occupancy
+of many dates is a merge of each date's template against that date's booked
+intervals (see crud/aio/slot.py, which loads them with one query per range). Conversion to `time` objects and display strings
+only happens at the edges, through precomputed lookup tables.
+"""
+
+import threading
+from bisect import bisect_right
+from datetime import date, time
+from time import monotonic
+from typing import Iterable, Iterator
+
+DEFAULT_SLOT_MINUTES = 30
+MINUTES_PER_DAY = 24 * 60
+WEEKDAYS = ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday")
+
+Interval = tuple[int, int]
+
+# End-of-day bound: 24:00 is stored as 23:59:59, the last representable time
+END_OF_DAY = time(23, 59, 59)
+
+# Lookup tables indexed by minute of day (the extra entry covers 24:00 as an end bound)
+_TIMES = [time(m // 60, m % 60) for m in range(MINUTES_PER_DAY)] + [END_OF_DAY]
+_LABELS_24H = [f"{m // 60:02d}:{m % 60:02d}" for m in range(MINUTES_PER_DAY)] + ["24:00"]
+_LABELS_12H = [t.strftime('%I:%M %p') for t in _TIMES[:MINUTES_PER_DAY]] + ["12:00 AM"]
+
+
+def to_minutes(t: time) -> int:
+    """
+    Convert a time object to minutes since midnight; END_OF_DAY maps to 1440.
+    """
+    if t == END_OF_DAY:
+        return MINUTES_PER_DAY
+    return t.hour * 60 + t.minute
+
+def to_time(minutes: int) -> time:
+    """
+    Convert minutes since midnight to a time object.
+    """
+    return _TIMES[minutes]
+
+def format_24h(minutes: int) -> str:
+    """
+    Format minutes since midnight as 'HH:MM'.
+    """
+    return _LABELS_24H[minutes]
+
+def format_12h(minutes: int) -> str:
+    """
+    Format minutes since midnight as 'HH:MM AM/PM'.
+    """
+    return _LABELS_12H[minutes]
+
+def parse_hhmm(value: str) -> int:
+    """
+    Parse a 'HH:MM' (24-hour) string to minutes since midnight.
+    Raises:
+        ValueError: If the string is not a valid 'HH:MM' time
+    """
+    hours, _, minutes = value.strip().partition(':')
+    if not hours.isdigit() or not minutes.isdigit():
+        raise ValueError(f"Invalid time format: {value}. Expected format: 'HH:MM'")
+    result = int(hours) * 60 + int(minutes)
+    if int(minutes) > 59 or result > MINUTES_PER_DAY:
+        raise ValueError(f"Invalid time format: {value}. Expected format: 'HH:MM'")
+    return result
+
+def split_range(start: int, end: int, slot_minutes: int) -> list[Interval]:
+    """
+    Split a working range into consecutive slots of equal length.
+    """
+    return [(s, s + slot_minutes) for s in range(start, end - slot_minutes + 1, slot_minutes)]
+
+
+class IntervalIndex:
+    """
+    Static index over a set of intervals answering containment queries in
+    O(log n). Intervals are merged into sorted disjoint runs on construction,
+    which preserves the answer.
+    """
+
+    def __init__(self, intervals: Iterable[Interval]):
+        merged: list[list[int]] = []
+        for start, end in sorted(intervals):
+            if merged and start <= merged[-1][1]:
+                merged[-1][1] = max(merged[-1][1], end)
+            else:
+                merged.append([start, end])
+        self.starts = tuple(start for start, _ in merged)
+        self.ends = tuple(end for _, end in merged)
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def covers(self, start: int, end: int) -> bool:
+        """
+        Check whether [start, end) lies entirely within one interval run.
+        """
+        i = bisect_right(self.starts, start) - 1
+        return i >= 0 and self.ends[i] >= end
+
+
+class Schedule:
+    """
+    Compiled weekly schedule.
+    Attributes:
+        slot_minutes: Length of a slot in minutes
+        templates: Sorted slot intervals for each weekday (0 = Monday)
+        working: Working ranges of each weekday as an IntervalIndex
+    """
+
+    def __init__(self, ranges: dict[int, list[Interval]], slot_minutes: int = DEFAULT_SLOT_MINUTES):
+        self.slot_minutes = slot_minutes
+        templates = []
+        for weekday in range(7):
+            slots = set()
+            for start, end in ranges.get(weekday, []):
+                slots.update(split_range(start, end, slot_minutes))
+            templates.append(tuple(sorted(slots)))
+        self.templates: tuple[tuple[Interval, ...], ...] = tuple(templates)
+        self.working = tuple(IntervalIndex(ranges.get(weekday, [])) for weekday in range(7))
+        self._starts = tuple(frozenset(start for start, _ in t) for t in self.templates)
+
+    def day_slots(self, target_date: date) -> tuple[Interval, ...]:
+        """
+        Get every slot of a date, free or not.
+        """
+        return self.templates[target_date.weekday()]
+
+    def is_bookable(self, target_date: date, start: int, end: int, max_slots: int = 1) -> bool:
+        """
+        Check whether (start, end) is a valid appointment: it starts on one of
+        the date's slots, lasts 1 to max_slots whole slots and lies within a
+        single working range. O(log n) in the number of working ranges.
+        """
+        weekday = target_date.weekday()
+        length = end - start
+        return (
+            start in self._starts[weekday]
+            and 0 < length <= max_slots * self.slot_minutes
+            and length % self.slot_minutes == 0
+            and self.working[weekday].covers(start, end)
+        )
+
+def build_schedule(availabilities: Iterable, booking_settings=None) -> Schedule:
+    """
+    Compile availability rows and booking settings into a weekly schedule.
+    Availability rows for a weekday take precedence; the booking settings
+    working hours are used for weekdays without availability rows. The slot
+    length comes from the booking settings when they exist.
+    Args:
+        availabilities: Active Availability rows
+        booking_settings: BookingSettings row or None
+    Returns:
+        Schedule: The compiled schedule
+    """
+    index = {name.lower(): i for i, name in enumerate(WEEKDAYS)}
+    ranges: dict[int, list[Interval]] = {}
+    for a in availabilities:
+        weekday = index.get(a.weekday.strip().lower())
+        if weekday is not None:
+            ranges.setdefault(weekday, []).append((to_minutes(a.start_time), to_minutes(a.end_time)))
+
+    slot_minutes = DEFAULT_SLOT_MINUTES
+    if booking_settings is not None:
+        slot_minutes = int(booking_settings.slot_duration) or DEFAULT_SLOT_MINUTES
+        for name, hours in (booking_settings.working_hours or {}).items():
+            weekday = index.get(name.lower())
+            if weekday is None or weekday in ranges or not hours.get('enabled', False):
+                continue
+            ranges[weekday] = [(parse_hhmm(hours['start']), parse_hhmm(hours['end']))]
+    return Schedule(ranges, slot_minutes)
+
+def _subtract(template: tuple[Interval, ...], booked: list[Interval]) -> list[Interval]:
+    """
+    Drop every template slot that overlaps a booked interval (both sorted).
+    """
+    if not booked:
+        return list(template)
+    free = []
+    i, n = 0, len(booked)
+    for start, end in template:
+        while i < n and booked[i][1] <= start:
+            i += 1
+        if i < n and booked[i][0] < end:
+            continue
+        free.append((start, end))
+    return free
+
+def occupancy(schedule: Schedule, target_date: date, booked: list[Interval]) -> list[tuple[int, int, bool]]:
+    """
+    Get every slot of a date with a flag telling whether it is booked.
+    """
+    free = set(_subtract(schedule.day_slots(target_date), sorted(booked)))
+    return [(start, end, (start, end) not in free) for start, end in schedule.day_slots(target_date)]
+
+class ScheduleCache:
+    """
+    Process-wide compiled schedule, recompiled only when the stored schedule
+    version changes. The version is re-read at most every `check_seconds`.
+    """
+
+    def __init__(self, check_seconds: float):
+        self.check_seconds = check_seconds
+        self._lock = threading.Lock()
+        self._version: int | None = None
+        self._schedule: Schedule | None = None
+        self._checked_at = 0.0
+        self._stats = {"hits": 0, "compiles": 0}
+
+    def fresh(self) -> Schedule | None:
+        """
+        Get the schedule without a version check if it was verified recently.
+        """
+        with self._lock:
+            if self._schedule is not None and monotonic() - self._checked_at < self.check_seconds:
+                self._stats["hits"] += 1
+                return self._schedule
+            return None
+
+    def get(self, version: int) -> Schedule | None:
+        """
+        Get the schedule if it was compiled for `version`.
+        """
+        with self._lock:
+            if self._schedule is None or self._version != version:
+                return None
+            self._checked_at = monotonic()
+            self._stats["hits"] += 1
+            return self._schedule
+
+    def put(self, version: int, schedule: Schedule) -> Schedule:
+        with self._lock:
+            self._version, self._schedule = version, schedule
+            self._checked_at = monotonic()
+            self._stats["compiles"] += 1
+        return schedule
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._version, self._schedule = None, None
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {**self._stats, "version": self._version}
+
+# Occupancy bitmaps: bit i of a day's mask stands for slot i of that day's
+# template, so bit order is time order.
+
+def booked_mask(template: tuple[Interval, ...], booked: list[Interval]) -> int:
+    """
+    Set the bit of every template slot that overlaps a booked interval (both sorted).
+    """
+    mask = 0
+    i, n = 0, len(booked)
+    for bit, (start, end) in enumerate(template):
+        while i < n and booked[i][1] <= start:
+            i += 1
+        if i < n and booked[i][0] < end:
+            mask |= 1 << bit
+    return mask
+
+def window_mask(template: tuple[Interval, ...], start: int, end: int) -> int:
+    """
+    Set the bit of every template slot lying entirely within [start, end].
+    """
+    mask = 0
+    for bit, (slot_start, slot_end) in enumerate(template):
+        if slot_start >= start and slot_end <= end:
+            mask |= 1 << bit
+    return mask
+
+def iter_bits(mask: int) -> Iterator[int]:
+    """
+    Yield the positions of the set bits of a mask, lowest first.
+    """
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
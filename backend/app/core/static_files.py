@@ -0,0 +1,107 @@
+"""
+Static file serving with precompressed variants and long-lived caching.
+
+Text assets of the bundled Angular build are compressed once at build time
+(app/scripts/precompress_static.py) into `<file>.br` and `<file>.gz`
+siblings. When the client's Accept-Encoding allows it, the brotli or else
+the gzip variant is sent as is, with Content-Encoding and
+`Vary: Accept-Encoding`, so nothing is compressed per request.
+
+Files whose name embeds a hash of their content (Angular bundles such as
+`main-5Q2YB3XK.js` and the image variants written by
+core/image_derivatives.py) never change under the same URL, so browsers and
+CDNs may keep them for a year without revalidating. Other static files keep
+the default validation with ETag and Last-Modified.
+"""
+
+import mimetypes
+import os
+import re
+from fastapi.staticfiles import StaticFiles
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse
+from starlette.staticfiles import NotModifiedResponse
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+HASHED_NAMES = (
+    # '<20 hex digits>-<width>w.<ext>', as named by image_derivatives
+    re.compile(r"^[0-9a-f]{20}-\d+w\.[a-z0-9]+$"),
+    # Angular output hashing: 'main-5Q2YB3XK.js' (esbuild), 'main.3f2a9c1e0b7d4e21.js' (webpack)
+    re.compile(r"^[\w.-]+[-.]([A-Z0-9]{8}|[0-9a-f]{16,20})\.(js|mjs|css|woff2?|ttf|eot|svg|png|jpe?g|gif|webp|avif|ico)$"),
+)
+
+# Precompressed siblings in order of preference: (Content-Encoding, suffix)
+ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+
+# File types worth compressing
+COMPRESSIBLE_EXTENSIONS = {
+    ".html", ".js", ".mjs", ".css", ".json", ".map", ".svg", ".txt", ".xml",
+    ".webmanifest", ".ico", ".ttf", ".eot",
+}
+
+
+def is_hashed_name(filename: str) -> bool:
+    return any(pattern.match(filename) for pattern in HASHED_NAMES)
+
+def accepted_encodings(accept_encoding: str) -> set[str]:
+    """
+    Content codings the client accepts (q > 0), from an Accept-Encoding header.
+    """
+    accepted = set()
+    for item in accept_encoding.split(","):
+        coding, _, params = item.strip().partition(";")
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if coding and q > 0:
+            accepted.add(coding.strip().lower())
+    if "*" in accepted:
+        accepted.update(coding for coding, _ in ENCODINGS)
+    return accepted
+
+
+class CachedStaticFiles(StaticFiles):
+    """
+    StaticFiles that serves precompressed variants and marks
+    content-addressed files as immutable.
+    """
+
+    def file_response(self, full_path, stat_result, scope, status_code: int = 200):
+        original = os.fspath(full_path)
+        request_headers = Headers(scope=scope)
+        headers = {}
+        if is_hashed_name(os.path.basename(original)):
+            headers["Cache-Control"] = IMMUTABLE_CACHE_CONTROL
+        if os.path.splitext(original)[1].lower() in COMPRESSIBLE_EXTENSIONS:
+            headers["Vary"] = "Accept-Encoding"
+            accepted = accepted_encodings(request_headers.get("accept-encoding", ""))
+            for coding, suffix in ENCODINGS:
+                if coding not in accepted:
+                    continue
+                try:
+                    variant_stat = os.stat(original + suffix)
+                except OSError:
+                    continue
+                # Ignore a variant left over from an older version of the file
+                if variant_stat.st_mtime >= stat_result.st_mtime:
+                    full_path, stat_result = original + suffix, variant_stat
+                    headers["Content-Encoding"] = coding
+                    break
+
+        response = FileResponse(
+            full_path,
+            status_code=status_code,
+            headers=headers,
+            media_type=mimetypes.guess_type(original)[0],
+            stat_result=stat_result,
+            method=scope["method"],
+        )
+        if self.is_not_modified(response.headers, request_headers):
+            return NotModifiedResponse(response.headers)
+        return response
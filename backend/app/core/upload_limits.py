@@ -0,0 +1,73 @@
+"""
+Request body size cap for upload routes.
+
+Starlette parses a multipart body completely (spooling files to disk)
+before the route runs, so a route-level size check only happens after an
+oversized upload has been received. This ASGI middleware answers 413 as
+soon as the declared Content-Length, or the bytes actually received, exceed
+the cap, and stops feeding the body to the application.
+"""
+
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse
+
+# Allowance for the multipart boundaries, headers and text fields around the file
+MULTIPART_OVERHEAD_BYTES = 64 * 1024
+
+
+class UploadSizeLimitMiddleware:
+    """
+    Reject POST bodies larger than max_body_bytes on the named routes.
+    """
+
+    def __init__(self, app, max_body_bytes: int, route_names: tuple[str, ...]):
+        self.app = app
+        self.max_body_bytes = max_body_bytes
+        self.route_names = route_names
+        self._paths: set[str] | None = None
+
+    def _limited(self, scope) -> bool:
+        if scope["type"] != "http" or scope["method"] != "POST":
+            return False
+        if self._paths is None:
+            # Resolved on first use, once the routers are included
+            self._paths = {scope["app"].url_path_for(name) for name in self.route_names}
+        return scope["path"] in self._paths
+
+    def _response(self) -> JSONResponse:
+        return JSONResponse(status_code=413, content={"detail": "Upload is too large"})
+
+    async def __call__(self, scope, receive, send):
+        if not self._limited(scope):
+            await self.app(scope, receive, send)
+            return
+        length = Headers(scope=scope).get("content-length", "")
+        if length.isdigit() and int(length) > self.max_body_bytes:
+            await self._response()(scope, receive, send)
+            return
+
+        received = 0
+        rejected = False
+
+        async def limited_receive():
+            nonlocal received, rejected
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_body_bytes:
+                    if not rejected:
+                        rejected = True
+                        await self._response()(scope, receive, send)
+                    # The application sees a disconnected client and stops parsing
+                    return {"type": "http.disconnect"}
+            return message
+
+        async def guarded_send(message):
+            if not rejected:
+                await send(message)
+
+        try:
+            await self.app(scope, limited_receive, guarded_send)
+        except Exception:
+            if not rejected:
+                raise
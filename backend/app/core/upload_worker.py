@@ -0,0 +1,172 @@
+"""
+Background worker that pushes staged slider images to the image backend.
+
+Upload requests only stage the file and create a pending row, then enqueue
+its id here. The worker runs on the application's event loop and performs
+the blocking database and backend calls on a small dedicated thread pool, so
+at most UPLOAD_WORKERS uploads run at once and request threads are never
+occupied by them. Before the upload the resized variants are built (see
+core/image_derivatives.py). Failed uploads are retried with exponential
+backoff up to UPLOAD_MAX_ATTEMPTS; files that are not decodable images fail
+at once. The staged file of a failed upload is deleted. Rows are claimed
+atomically, so a row enqueued by several processes is uploaded once; on
+startup each process re-queues the unfinished uploads left in the database.
+"""
+
+import asyncio
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from .config import settings
+from .database import SessionLocal
+from .image_storage import get_image_backend
+from .image_derivatives import build_derivatives, InvalidImageError
+from ..crud.slider_image import (
+    claim_slider_upload, complete_slider_upload, fail_slider_upload, unfinished_slider_uploads
+)
+
+logger = logging.getLogger(__name__)
+
+
+class UploadWorker:
+    """
+    Asyncio queue of slider image ids consumed by `concurrency` tasks.
+    """
+
+    def __init__(self, concurrency: int, max_attempts: int, retry_base_seconds: float):
+        self.concurrency = concurrency
+        self.max_attempts = max_attempts
+        self.retry_base_seconds = retry_base_seconds
+        self.backend = None
+        self._executor: ThreadPoolExecutor | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._queue: asyncio.Queue | None = None
+        self._tasks: list[asyncio.Task] = []
+        self._retries: set[asyncio.TimerHandle] = set()
+        self._lock = threading.Lock()
+        self._stats = {"queued": 0, "uploaded": 0, "retried": 0, "failed": 0}
+
+    async def start(self) -> None:
+        """
+        Start the consumer tasks and re-queue unfinished uploads.
+        """
+        self.backend = get_image_backend()
+        self._executor = ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="image-upload")
+        self._loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue()
+        self._tasks = [asyncio.create_task(self._consume()) for _ in range(self.concurrency)]
+        for image_id in await self._run(self._unfinished):
+            self.enqueue(image_id)
+
+    async def stop(self) -> None:
+        """
+        Cancel the consumers; uploads still queued stay pending in the database.
+        """
+        for handle in self._retries:
+            handle.cancel()
+        self._retries.clear()
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._queue = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+
+    def enqueue(self, image_id: int) -> None:
+        """
+        Queue a pending slider image for upload. Safe to call from any thread;
+        without a running worker the row stays pending until the next start.
+        """
+        loop, queue = self._loop, self._queue
+        if queue is None:
+            return
+        with self._lock:
+            self._stats["queued"] += 1
+        if loop is not None and loop.is_running():
+            loop.call_soon_threadsafe(queue.put_nowait, image_id)
+
+    async def _run(self, fn, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+
+    async def _consume(self) -> None:
+        while True:
+            image_id = await self._queue.get()
+            try:
+                await self._upload(image_id)
+            except Exception:
+                logger.exception("Slider image %s upload crashed", image_id)
+            finally:
+                self._queue.task_done()
+
+    async def _upload(self, image_id: int) -> None:
+        job = await self._run(self._claim, image_id)
+        if job is None:
+            return
+        path, attempt, digest = job
+        try:
+            # Variants first: a local backend moves the staged file away
+            variants = await self._run(build_derivatives, path, digest)
+            url = await self._run(self.backend.upload, path)
+        except Exception as e:
+            retry = attempt < self.max_attempts and not isinstance(e, InvalidImageError)
+            await self._run(self._fail, image_id, str(e) or type(e).__name__, retry, path)
+            with self._lock:
+                self._stats["retried" if retry else "failed"] += 1
+            if retry:
+                delay = self.retry_base_seconds * 2 ** (attempt - 1)
+                logger.warning("Slider image %s upload failed (attempt %s), retrying in %ss: %s", image_id, attempt, delay, e)
+                self._schedule_retry(image_id, delay)
+            else:
+                logger.error("Slider image %s upload failed after %s attempts: %s", image_id, attempt, e)
+            return
+        await self._run(self._complete, image_id, url, path, variants)
+        with self._lock:
+            self._stats["uploaded"] += 1
+
+    def _schedule_retry(self, image_id: int, delay: float) -> None:
+        def fire():
+            self._retries.discard(handle)
+            self.enqueue(image_id)
+        handle = self._loop.call_later(delay, fire)
+        self._retries.add(handle)
+
+    # Blocking steps, run on the worker's thread pool
+
+    @staticmethod
+    def _unfinished() -> list[int]:
+        with SessionLocal() as db:
+            return unfinished_slider_uploads(db, settings.UPLOAD_STALE_SECONDS)
+
+    @staticmethod
+    def _claim(image_id: int):
+        with SessionLocal() as db:
+            return claim_slider_upload(db, image_id)
+
+    @staticmethod
+    def _fail(image_id: int, error: str, retry: bool, path: str) -> None:
+        with SessionLocal() as db:
+            fail_slider_upload(db, image_id, error, retry)
+        # The staged file stays for a retry and is dropped once the upload gave up
+        if not retry and os.path.exists(path):
+            os.remove(path)
+
+    @staticmethod
+    def _complete(image_id: int, url: str, path: str, variants: dict | None) -> None:
+        with SessionLocal() as db:
+            complete_slider_upload(db, image_id, url, variants)
+        if os.path.exists(path):
+            os.remove(path)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                **self._stats,
+                "backend": getattr(self.backend, "name", None),
+                "waiting": self._queue.qsize() if self._queue is not None else 0,
+                "retry_scheduled": len(self._retries),
+            }
+
+
+upload_worker = UploadWorker(settings.UPLOAD_WORKERS, settings.UPLOAD_MAX_ATTEMPTS, settings.UPLOAD_RETRY_BASE_SECONDS)
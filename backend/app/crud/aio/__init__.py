@@ -0,0 +1,7 @@
+"""
+Async counterparts of the crud modules, for routes that run on the event loop.
+
+Reads are issued natively through AsyncSession. Writes reuse the sync crud
+functions through AsyncSession.run_sync, so the slot inventory, counters and
+other write-side bookkeeping live in exactly one place.
+"""
@@ -0,0 +1,64 @@
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from ...models.availability import Availability, BookingSettings, ScheduleState, SCHEDULE_STATE_ID
+from ...schemas.availability import AvailabilityCreate
+from ...core.slot_engine import Schedule, build_schedule
+from .. import availability as sync_availability
+from ..availability import schedule_cache
+
+
+async def create_availability(db: AsyncSession, availability: AvailabilityCreate) -> Availability:
+    """
+    Create a new availability slot and refresh the slot inventory.
+    """
+    return await db.run_sync(sync_availability.create_availability, availability)
+
+async def get_all_availability(db: AsyncSession, skip: int = 0, limit: int | None = 100) -> list[Availability]:
+    """
+    Get all availability slots (without a limit when `limit` is None).
+    """
+    stmt = select(Availability).offset(skip).limit(limit)
+    return list((await db.execute(stmt)).scalars().all())
+
+async def get_availability_by_weekday(db: AsyncSession, weekday: str) -> list[Availability]:
+    """
+    Get active availability slots for a specific weekday (case-insensitive).
+    """
+    stmt = select(Availability).where(
+        func.lower(Availability.weekday) == func.lower(weekday),
+        Availability.is_active == True
+    )
+    return list((await db.execute(stmt)).scalars().all())
+
+async def delete_availability(db: AsyncSession, availability_id: int) -> bool:
+    """
+    Delete an availability slot and refresh the slot inventory.
+    """
+    return await db.run_sync(sync_availability.delete_availability, availability_id)
+
+async def get_booking_settings(db: AsyncSession) -> BookingSettings | None:
+    """
+    Get the booking settings version in effect, or None if none was saved.
+    """
+    stmt = select(BookingSettings).join(ScheduleState, ScheduleState.current_settings_id == BookingSettings.id)
+    current = (await db.execute(stmt)).scalars().first()
+    if current is None:
+        stmt = select(BookingSettings).order_by(BookingSettings.id.desc())
+        current = (await db.execute(stmt)).scalars().first()
+    return current
+
+async def load_schedule(db: AsyncSession) -> Schedule:
+    """
+    Get the compiled weekly schedule of this process, recompiling it only
+    when the stored schedule version changed.
+    """
+    schedule = schedule_cache.fresh()
+    if schedule is not None:
+        return schedule
+    stmt = select(ScheduleState.version).where(ScheduleState.id == SCHEDULE_STATE_ID)
+    version = (await db.execute(stmt)).scalar() or 0
+    schedule = schedule_cache.get(version)
+    if schedule is None:
+        availabilities = (await db.execute(select(Availability).where(Availability.is_active == True))).scalars().all()
+        schedule = schedule_cache.put(version, build_schedule(availabilities, await get_booking_settings(db)))
+    return schedule
@@ -0,0 +1,39 @@
+from sqlalchemy import select
+from sqlalchemy.orm import joinedload
+from sqlalchemy.ext.asyncio import AsyncSession
+from ...models.booking import Booking
+from ...schemas.booking import BookingCreate
+from .. import booking as sync_booking
+
+
+async def create_booking(db: AsyncSession, user_id: int, booking: BookingCreate) -> Booking:
+    """
+    Create a new booking for a user, with its user loaded for the response.
+    Raises:
+        SlotAlreadyBookedError: If the slot is already taken by an active booking
+    """
+    def create(session):
+        db_booking = sync_booking.create_booking(session, user_id, booking)
+        db_booking.user  # load the relationship while still inside the sync context
+        return db_booking
+    return await db.run_sync(create)
+
+async def get_bookings_by_user(db: AsyncSession, user_id: int) -> list[Booking]:
+    """
+    Get all bookings for a user, with the user eagerly loaded.
+    """
+    stmt = select(Booking).options(joinedload(Booking.user)).where(Booking.user_id == user_id)
+    return list((await db.execute(stmt)).scalars().all())
+
+async def get_bookings_by_status(db: AsyncSession, status: str) -> list[Booking]:
+    """
+    Get all bookings by status, with their users eagerly loaded.
+    """
+    stmt = select(Booking).options(joinedload(Booking.user)).where(Booking.status == status)
+    return list((await db.execute(stmt)).scalars().all())
+
+async def delete_booking(db: AsyncSession, booking_id: int, user_id: int) -> bool:
+    """
+    Delete (cancel) a booking if it belongs to the user.
+    """
+    return await db.run_sync(sync_booking.delete_booking, booking_id, user_id)
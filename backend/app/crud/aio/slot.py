@@ -0,0 +1,127 @@
+from datetime import date, timedelta
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from ...core.config import settings
+from ...models.slot import Slot, SLOT_FREE
+from ...models.booking import Booking, ACTIVE_BOOKING_STATUSES
+from ...core.slot_engine import Interval, Schedule, MINUTES_PER_DAY, to_minutes, booked_mask, window_mask, iter_bits
+from ...core.occupancy import occupancy_index
+from .availability import load_schedule
+from ..slot import in_slot_horizon, horizon_is_current, get_slots_for_date as sync_get_slots_for_date
+from ...core.slot_cache import slot_cache, SlotRow
+
+
+async def get_slots_for_date(db: AsyncSession, target_date: date) -> tuple[SlotRow, ...]:
+    """
+    Get all slots of a date with their state, as (start, end, state) tuples in minutes.
+    Results are cached per date and concurrent misses share one computation.
+    """
+    return await slot_cache.get_or_compute(target_date, lambda: _load_slots_for_date(db, target_date))
+
+async def _load_slots_for_date(db: AsyncSession, target_date: date) -> list[SlotRow]:
+    """
+    The common case is a single indexed range scan on the inventory; horizon
+    maintenance and out-of-horizon dates go through the sync implementation.
+    """
+    if not (in_slot_horizon(target_date) and horizon_is_current()):
+        return await db.run_sync(sync_get_slots_for_date, target_date)
+    stmt = (
+        select(Slot.start_time, Slot.end_time, Slot.state)
+        .where(Slot.date == target_date)
+        .order_by(Slot.start_time)
+    )
+    return [
+        (to_minutes(row.start_time), to_minutes(row.end_time), row.state)
+        for row in await db.execute(stmt)
+    ]
+
+async def get_free_slots(db: AsyncSession, target_date: date) -> list[Interval]:
+    """
+    Get the free slots of a date as (start, end) tuples in minutes.
+    """
+    return [(start, end) for start, end, state in await get_slots_for_date(db, target_date) if state == SLOT_FREE]
+
+async def _load_booked_masks(db: AsyncSession, schedule: Schedule, dates: list[date]) -> dict[date, int]:
+    """
+    Compute the occupancy bitmaps of many dates with a single booking query.
+    """
+    stmt = select(Booking.date, Booking.start_time, Booking.end_time).where(
+        Booking.date >= min(dates),
+        Booking.date <= max(dates),
+        Booking.status.in_(ACTIVE_BOOKING_STATUSES)
+    )
+    booked: dict[date, list[Interval]] = {}
+    for row in await db.execute(stmt):
+        booked.setdefault(row.date, []).append((to_minutes(row.start_time), to_minutes(row.end_time)))
+    return {d: booked_mask(schedule.day_slots(d), sorted(booked.get(d, ()))) for d in dates}
+
+async def get_occupancy_masks(db: AsyncSession, schedule: Schedule, dates: list[date]) -> dict[date, int]:
+    """
+    Get the occupancy bitmaps of dates, loading the ones missing from the index
+    with a single booking query.
+    """
+    masks, missing, token = occupancy_index.lookup(schedule, dates)
+    if missing:
+        loaded = await _load_booked_masks(db, schedule, missing)
+        occupancy_index.store(schedule, loaded, token)
+        masks.update(loaded)
+    return masks
+
+async def next_free_slots(
+    db: AsyncSession,
+    from_date: date,
+    count: int,
+    window_start: int = 0,
+    window_end: int = MINUTES_PER_DAY,
+    not_before: int = 0,
+) -> list[tuple[date, int, int]]:
+    """
+    Find the earliest free slots from a date on by scanning occupancy bitmaps.
+    Days are examined in growing chunks; only days missing from the occupancy
+    index cost a query, one per chunk.
+    Args:
+        db (AsyncSession): Async SQLAlchemy session
+        from_date (date): First date to search
+        count (int): Number of slots to return
+        window_start (int): Earliest slot start, in minutes
+        window_end (int): Latest slot end, in minutes
+        not_before (int): Earliest slot start on from_date itself, in minutes
+    Returns:
+        list[tuple[date, int, int]]: (date, start, end) of the free slots, in time order
+    """
+    schedule = await load_schedule(db)
+    windows = [window_mask(template, window_start, window_end) for template in schedule.templates]
+    found: list[tuple[date, int, int]] = []
+    if not any(windows):
+        return found
+
+    last_date = from_date + timedelta(days=settings.NEXT_SLOT_SEARCH_DAYS - 1)
+    chunk_start, chunk_days = from_date, 7
+    while chunk_start <= last_date:
+        chunk_end = min(chunk_start + timedelta(days=chunk_days - 1), last_date)
+        dates = [
+            d for d in (chunk_start + timedelta(days=i) for i in range((chunk_end - chunk_start).days + 1))
+            if windows[d.weekday()]
+        ]
+        if dates:
+            masks = await get_occupancy_masks(db, schedule, dates)
+            for d in dates:
+                template = schedule.day_slots(d)
+                for bit in iter_bits(windows[d.weekday()] & ~masks[d]):
+                    start, end = template[bit]
+                    if d == from_date and start < not_before:
+                        continue
+                    found.append((d, start, end))
+                    if len(found) == count:
+                        return found
+        chunk_start, chunk_days = chunk_end + timedelta(days=1), min(chunk_days * 2, 64)
+    return found
+
+async def get_calendar(db: AsyncSession, start_date: date, end_date: date) -> tuple[Schedule, dict[date, int]]:
+    """
+    Get the compiled schedule and the occupancy bitmap of every date in a range
+    (inclusive), at the cost of at most one booking query.
+    """
+    schedule = await load_schedule(db)
+    dates = [start_date + timedelta(days=i) for i in range((end_date - start_date).days + 1)]
+    return schedule, await get_occupancy_masks(db, schedule, dates)
@@ -0,0 +1,78 @@
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from ...models.user import User, ROLE_PATIENT, ROLE_ADMIN
+from ...auth.security import ahash_password, averify_password
+
+
+async def get_user_by_id(db: AsyncSession, user_id: int) -> User | None:
+    """
+    Get a user by ID.
+    Args:
+        db (AsyncSession): Async SQLAlchemy session
+        user_id (int): User's ID
+    Returns:
+        User: The user object if found, None otherwise
+    """
+    return (await db.execute(select(User).where(User.id == user_id))).scalar_one_or_none()
+
+async def get_user_by_email(db: AsyncSession, email: str, role: str | None = None) -> User | None:
+    """
+    Get a user by email address, optionally restricted to a role.
+    """
+    stmt = select(User).where(User.email == email)
+    if role:
+        stmt = stmt.where(User.role == role)
+    return (await db.execute(stmt)).scalars().first()
+
+async def authenticate_user(db: AsyncSession, email: str, password: str) -> User | None:
+    """
+    Authenticate a user by email and password.
+    Returns:
+        User: The authenticated user object if credentials are valid
+        None: If credentials are invalid
+    """
+    user = await get_user_by_email(db, email)
+    if not user:
+        return None
+    if not await averify_password(password, user.hashed_password):
+        return None
+    return user
+
+async def create_patient_user(db: AsyncSession, name: str, email: str, phone_number: str, age: int, gender: str, password: str) -> User:
+    """
+    Create a new patient user with hashed password.
+    Raises:
+        ValueError: If email already exists
+    """
+    hashed_pw = await ahash_password(password)
+    user = User(name=name, email=email, phone_number=phone_number, age=age, gender=gender, hashed_password=hashed_pw, role=ROLE_PATIENT)
+    db.add(user)
+    try:
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        raise ValueError("Email already registered")
+    await db.refresh(user)
+    return user
+
+async def create_default_admin(db: AsyncSession) -> User:
+    """
+    Create the default admin user if it doesn't exist.
+    """
+    admin_email = "admin@clinic.com"
+    admin = await get_user_by_email(db, admin_email)
+    if not admin:
+        admin = User(
+            name="admin",
+            email=admin_email,
+            phone_number="0000000000",
+            age=30,
+            gender="Not specified",
+            hashed_password=await ahash_password("admin123"),
+            role=ROLE_ADMIN
+        )
+        db.add(admin)
+        await db.commit()
+        await db.refresh(admin)
+    return admin
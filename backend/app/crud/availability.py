@@ -1,10 +1,17 @@
 from sqlalchemy.orm import Session
 from sqlalchemy import func
-from datetime import time, datetime, timedelta
-from ..models.availability import Availability, BookingSettings
+from datetime import time, datetime
+from ..models.availability import Availability, BookingSettings, ScheduleState, SCHEDULE_STATE_ID
 from ..schemas.availability import AvailabilityCreate, BookingSettingsCreate
+from ..core.config import settings as app_settings
+from ..core.slot_engine import Schedule, ScheduleCache, build_schedule
+from .slot import refresh_slot_inventory
+from ..core.response_cache import response_cache, CACHE_AVAILABILITY
 import re
 
+# Compiled schedule of this process, keyed by ScheduleState.version
+schedule_cache = ScheduleCache(app_settings.SCHEDULE_VERSION_CHECK_SECONDS)
+
 
 def create_availability(db: Session, availability: AvailabilityCreate) -> Availability:
     """
@@ -26,8 +33,12 @@ def create_availability(db: Session, availability: AvailabilityCreate) -> Availa
         is_active=True
     )
     db.add(db_availability)
+    bump_schedule_version(db)
     db.commit()
     db.refresh(db_availability)
+    schedule_cache.invalidate()
+    response_cache.bump(CACHE_AVAILABILITY)
+    refresh_slot_inventory(db)
     return db_availability
 
 def get_all_availability(db: Session, skip: int = 0, limit: int = 100) -> list[Availability]:
@@ -80,7 +91,11 @@ def delete_availability(db: Session, availability_id: int) -> bool:
     availability = db.query(Availability).filter(Availability.id == availability_id).first()
     if availability:
         db.delete(availability)
+        bump_schedule_version(db)
         db.commit()
+        schedule_cache.invalidate()
+        response_cache.bump(CACHE_AVAILABILITY)
+        refresh_slot_inventory(db)
         return True
     return False
 
@@ -114,57 +129,72 @@ def convert_time_string_to_time(time_str: str) -> time:
     return time(hour, minute)
 
 # BookingSettings CRUD functions
+def bump_schedule_version(db: Session, current_settings_id: int | None = None) -> None:
+    """
+    Increment the schedule version, optionally pointing at a new settings version.
+    The row lock taken by the UPDATE serializes concurrent writers.
+    Does not commit; callers run it in their own transaction.
+    """
+    changes = {ScheduleState.version: ScheduleState.version + 1, ScheduleState.updated_at: datetime.utcnow()}
+    if current_settings_id is not None:
+        changes[ScheduleState.current_settings_id] = current_settings_id
+    updated = db.query(ScheduleState).filter(ScheduleState.id == SCHEDULE_STATE_ID).update(changes, synchronize_session=False)
+    if not updated:
+        db.add(ScheduleState(id=SCHEDULE_STATE_ID, version=1, current_settings_id=current_settings_id))
+
 def save_booking_settings(db: Session, settings: BookingSettingsCreate):
-    # Delete existing settings (we only keep one record)
-    db.query(BookingSettings).delete()
-    
-    # Create new settings
+    """
+    Store booking settings as a new immutable version and make it current.
+    Readers keep seeing the previous version until the pointer update commits.
+    Args:
+        db (Session): SQLAlchemy session
+        settings (BookingSettingsCreate): Slot duration and working hours
+    Returns:
+        BookingSettings: The new settings version
+    """
     db_settings = BookingSettings(
         slot_duration=settings.slot_duration,
-        working_hours=settings.working_hours
+        working_hours={day: hours.dict() for day, hours in settings.working_hours.items()}
     )
     db.add(db_settings)
+    db.flush()
+    bump_schedule_version(db, db_settings.id)
     db.commit()
     db.refresh(db_settings)
+    schedule_cache.invalidate()
+    refresh_slot_inventory(db)
     return db_settings
 
 def get_booking_settings(db: Session):
-    return db.query(BookingSettings).first()
+    """
+    Get the booking settings version in effect, or None if none was saved.
+    """
+    current = db.query(BookingSettings).join(
+        ScheduleState, ScheduleState.current_settings_id == BookingSettings.id
+    ).first()
+    if current is None:
+        # Databases from before settings were versioned have no pointer yet
+        current = db.query(BookingSettings).order_by(BookingSettings.id.desc()).first()
+    return current
+
+def get_schedule_version(db: Session) -> int:
+    return db.query(ScheduleState.version).filter(ScheduleState.id == SCHEDULE_STATE_ID).scalar() or 0
 
-def generate_booking_slots(db: Session, date: str):
+def load_schedule(db: Session) -> Schedule:
     """
-    Generate available booking slots for a specific date based on booking settings.
+    Get the compiled weekly schedule of this process.
+    Availability and settings are only read and compiled again when the
+    stored schedule version changed since the last compile.
+    Args:
+        db (Session): SQLAlchemy session
+    Returns:
+        Schedule: Compiled schedule used by the slot engine
     """
-    settings = get_booking_settings(db)
-    if not settings:
-        return []
-    
-    # Get day name from date
-    date_obj = datetime.strptime(date, '%Y-%m-%d')
-    day_name = date_obj.strftime('%A')
-    
-    # Get working hours for this day
-    working_hours = settings.working_hours.get(day_name, {})
-    if not working_hours.get('enabled', False):
-        return []
-    
-    start_time = working_hours['start']  # "09:00"
-    end_time = working_hours['end']      # "17:00"
-    slot_duration = int(settings.slot_duration)  # 30 minutes
-    
-    slots = []
-    current_time = datetime.strptime(start_time, '%H:%M')
-    end_time_obj = datetime.strptime(end_time, '%H:%M')
-    
-    while current_time + timedelta(minutes=slot_duration) <= end_time_obj:
-        slot_start = current_time.strftime('%H:%M')
-        slot_end_dt = current_time + timedelta(minutes=slot_duration)
-        slot_end = slot_end_dt.strftime('%H:%M')
-        slots.append({
-            'start_time': slot_start,
-            'end_time': slot_end,
-            'available': True
-        })
-        current_time = slot_end_dt
-    
-    return slots 
\ No newline at end of file
+    schedule = schedule_cache.fresh()
+    if schedule is not None:
+        return schedule
+    version = get_schedule_version(db)
+    schedule = schedule_cache.get(version)
+    if schedule is None:
+        schedule = schedule_cache.put(version, build_schedule(get_availability(db), get_booking_settings(db)))
+    return schedule
@@ -1,7 +1,21 @@
-from sqlalchemy.orm import Session
-from datetime import date, time
-from ..models.booking import Booking
+from sqlalchemy.orm import Session, joinedload, contains_eager
+from sqlalchemy import tuple_, select, update, delete
+from sqlalchemy.exc import IntegrityError
+from datetime import date, time, datetime
+from ..models.booking import Booking, ACTIVE_BOOKING_STATUSES
+from .user import user_search_criteria, user_search_rank
 from ..schemas.booking import BookingCreate
+from .slot import (
+    claim_slots, covered_slot_count, release_slots, release_slots_of, invalidate_slot_dates,
+    in_slot_horizon, ensure_slot_horizon
+)
+from .stats import count_booking_change, recount_booking_dates
+
+
+class SlotAlreadyBookedError(ValueError):
+    """
+    Raised when an active booking already holds the requested slot.
+    """
 
 
 def create_booking(db: Session, user_id: int, booking: BookingCreate) -> Booking:
@@ -13,11 +27,17 @@ def create_booking(db: Session, user_id: int, booking: BookingCreate) -> Booking
         booking (BookingCreate): Booking data
     Returns:
         Booking: The created booking object
+    Raises:
+        SlotAlreadyBookedError: If the slot is already taken by an active booking
     """
     # Parse time from 'HH:MM am/pm' string
     from ..schemas.availability import AvailabilityCreate
     start_time = AvailabilityCreate.parse_time_string(booking.start_time)
     end_time = AvailabilityCreate.parse_time_string(booking.end_time)
+    in_horizon = in_slot_horizon(booking.date)
+    if in_horizon:
+        # May commit a rebuild, so run it before the booking's transaction starts
+        ensure_slot_horizon(db)
     db_booking = Booking(
         user_id=user_id,
         date=booking.date,
@@ -26,15 +46,56 @@ def create_booking(db: Session, user_id: int, booking: BookingCreate) -> Booking
         status="booked"
     )
     db.add(db_booking)
+    try:
+        # A single INSERT; the partial unique index rejects a taken start time
+        # atomically, and on PostgreSQL the exclusion constraint any overlap
+        db.flush()
+    except IntegrityError:
+        db.rollback()
+        raise SlotAlreadyBookedError("Slot already booked")
+    if in_horizon:
+        # An overlapping booking holds at least one of the covered slots, which
+        # then is not claimed; the slot row locks order concurrent claims
+        conflict = claim_slots(db, db_booking) < covered_slot_count(db, db_booking)
+    else:
+        # No inventory outside the horizon to claim; the exclusion constraint
+        # settles a race with a concurrent overlapping insert at flush
+        conflict = has_overlapping_booking(db, db_booking)
+    if conflict:
+        db.rollback()
+        raise SlotAlreadyBookedError("Slot already booked")
+    count_booking_change(db, None, (db_booking.date, db_booking.status))
     db.commit()
+    invalidate_slot_dates(db_booking.date)
     db.refresh(db_booking)
     return db_booking
 
+def has_overlapping_booking(db: Session, booking: Booking) -> bool:
+    """
+    Check whether another active booking overlaps a booking's time range.
+    Used where no slot claim detects the conflict, e.g. dates outside the
+    slot horizon. Inside the horizon call it after claim_slots: overlapping
+    bookings share an inventory slot, whose row lock orders the two
+    transactions, so this read sees the one that committed first.
+    Args:
+        db (Session): SQLAlchemy session
+        booking (Booking): Flushed booking to check
+    Returns:
+        bool: True if the booking conflicts with another one
+    """
+    return db.query(Booking.id).filter(
+        Booking.date == booking.date,
+        Booking.id != booking.id,
+        Booking.status.in_(ACTIVE_BOOKING_STATUSES),
+        Booking.start_time < booking.end_time,
+        Booking.end_time > booking.start_time
+    ).first() is not None
+
 def get_bookings_by_user(db: Session, user_id: int) -> list[Booking]:
     """
-    Get all bookings for a user.
+    Get all bookings for a user, with the user eagerly loaded.
     """
-    return db.query(Booking).filter(Booking.user_id == user_id).all()
+    return db.query(Booking).options(joinedload(Booking.user)).filter(Booking.user_id == user_id).all()
 
 def get_user_bookings(db: Session, user_id: int) -> list[Booking]:
     """
@@ -44,9 +105,85 @@ def get_user_bookings(db: Session, user_id: int) -> list[Booking]:
 
 def get_bookings_by_status(db: Session, status: str) -> list[Booking]:
     """
-    Get all bookings by status.
+    Get all bookings by status, with their users eagerly loaded.
     """
-    return db.query(Booking).filter(Booking.status == status).all()
+    return db.query(Booking).options(joinedload(Booking.user)).filter(Booking.status == status).all()
+
+def search_bookings(db: Session, q: str, limit: int = 50) -> list[Booking]:
+    """
+    Search bookings by patient name, email or phone number with their patients loaded.
+    Best patient matches come first, then the most recent bookings.
+    Args:
+        db (Session): SQLAlchemy session
+        q (str): Search text
+        limit (int): Maximum number of bookings to return
+    Returns:
+        list[Booking]: Matching bookings with `user` populated
+    """
+    query = db.query(Booking).join(Booking.user).options(contains_eager(Booking.user))
+    query = query.filter(user_search_criteria(db, q))
+    rank = user_search_rank(db, q)
+    order = [Booking.date.desc(), Booking.start_time.desc(), Booking.id.desc()]
+    if rank is not None:
+        order.insert(0, rank.desc())
+    return query.order_by(*order).limit(limit).all()
+
+def get_bookings_page(
+    db: Session,
+    limit: int,
+    after: tuple[date, time, int] | None = None,
+    q: str | None = None,
+    date_from: date | None = None,
+    date_to: date | None = None,
+    status: str | None = None
+) -> tuple[list[Booking], tuple[date, time, int] | None]:
+    """
+    Get one page of bookings ordered by (date, start_time, id) with their patients loaded.
+    Args:
+        db (Session): SQLAlchemy session
+        limit (int): Maximum number of bookings to return
+        after (tuple | None): Sort key of the last booking of the previous page
+        q (str | None): Optional patient name, email or phone number filter
+        date_from (date | None): Earliest booking date (inclusive)
+        date_to (date | None): Latest booking date (inclusive)
+        status (str | None): Booking status filter
+    Returns:
+        tuple: The bookings and the sort key to continue after, or None on the last page
+    """
+    query = db.query(Booking).join(Booking.user).options(contains_eager(Booking.user))
+    if q:
+        query = query.filter(user_search_criteria(db, q))
+    if date_from:
+        query = query.filter(Booking.date >= date_from)
+    if date_to:
+        query = query.filter(Booking.date <= date_to)
+    if status:
+        query = query.filter(Booking.status == status)
+    if after:
+        query = query.filter(tuple_(Booking.date, Booking.start_time, Booking.id) > tuple_(*after))
+    rows = query.order_by(Booking.date, Booking.start_time, Booking.id).limit(limit + 1).all()
+    if len(rows) <= limit:
+        return rows, None
+    last = rows[limit - 1]
+    return rows[:limit], (last.date, last.start_time, last.id)
+
+def booking_cursor_key(key: tuple[date, time, int]) -> list:
+    """
+    Convert a booking sort key to JSON-serializable values.
+    """
+    return [key[0].isoformat(), key[1].strftime('%H:%M:%S'), key[2]]
+
+def parse_booking_cursor_key(values: list) -> tuple[date, time, int]:
+    """
+    Convert values produced by booking_cursor_key back to a sort key.
+    Raises:
+        ValueError: If the values are malformed
+    """
+    try:
+        day, start, booking_id = values
+        return date.fromisoformat(day), datetime.strptime(start, '%H:%M:%S').time(), int(booking_id)
+    except (TypeError, ValueError):
+        raise ValueError("Invalid cursor")
 
 def get_bookings_by_date(db: Session, target_date: date) -> list[Booking]:
     """
@@ -60,8 +197,12 @@ def delete_booking(db: Session, booking_id: int, user_id: int) -> bool:
     """
     booking = db.query(Booking).filter(Booking.id == booking_id, Booking.user_id == user_id).first()
     if booking:
+        before = (booking.date, booking.status)
         booking.status = "cancelled"
+        release_slots(db, booking)
+        count_booking_change(db, before, (booking.date, booking.status))
         db.commit()
+        invalidate_slot_dates(booking.date)
         return True
     return False
 
@@ -71,11 +212,97 @@ def admin_delete_booking(db: Session, booking_id: int) -> bool:
     """
     booking = db.query(Booking).filter(Booking.id == booking_id).first()
     if booking:
+        release_slots(db, booking)
+        count_booking_change(db, (booking.date, booking.status), None)
+        booking_date = booking.date
         db.delete(booking)
         db.commit()
+        invalidate_slot_dates(booking_date)
         return True
     return False
 
+def _batch_criteria(
+    ids: list[int] | None,
+    date_from: date | None,
+    date_to: date | None,
+    status: str | None
+) -> list:
+    criteria = []
+    if ids:
+        criteria.append(Booking.id.in_(ids))
+    if date_from:
+        criteria.append(Booking.date >= date_from)
+    if date_to:
+        criteria.append(Booking.date <= date_to)
+    if status:
+        criteria.append(Booking.status == status)
+    if not criteria:
+        raise ValueError("Select bookings by ids, date range or status")
+    return criteria
+
+def batch_update_booking_status(
+    db: Session,
+    new_status: str,
+    ids: list[int] | None = None,
+    date_from: date | None = None,
+    date_to: date | None = None,
+    status: str | None = None
+) -> int:
+    """
+    Set the status of every matching booking with one UPDATE ... RETURNING.
+    Inactive bookings are not re-activated in bulk, since that could double-book
+    their slots; slots, counters and slot caches are updated in the same pass.
+    Args:
+        db (Session): SQLAlchemy session
+        new_status (str): Status to set
+        ids, date_from, date_to, status: Filters, at least one is required
+    Returns:
+        int: Number of bookings updated
+    Raises:
+        ValueError: If no filter is given
+    """
+    criteria = _batch_criteria(ids, date_from, date_to, status) + [Booking.status != new_status]
+    if new_status in ACTIVE_BOOKING_STATUSES:
+        criteria.append(Booking.status.in_(ACTIVE_BOOKING_STATUSES))
+    else:
+        release_slots_of(db, select(Booking.id).where(*criteria))
+    dates = db.execute(
+        update(Booking).where(*criteria).values(status=new_status)
+        .returning(Booking.date)
+        .execution_options(synchronize_session=False)
+    ).scalars().all()
+    recount_booking_dates(db, set(dates))
+    db.commit()
+    invalidate_slot_dates(*set(dates))
+    return len(dates)
+
+def batch_delete_bookings(
+    db: Session,
+    ids: list[int] | None = None,
+    date_from: date | None = None,
+    date_to: date | None = None,
+    status: str | None = None
+) -> int:
+    """
+    Delete every matching booking with one DELETE ... RETURNING, freeing
+    their slots and recounting the affected dates in the same transaction.
+    Returns:
+        int: Number of bookings deleted
+    Raises:
+        ValueError: If no filter is given
+    """
+    criteria = _batch_criteria(ids, date_from, date_to, status)
+    release_slots_of(db, select(Booking.id).where(*criteria))
+    dates = db.execute(
+        delete(Booking).where(*criteria)
+        .returning(Booking.date)
+        .execution_options(synchronize_session=False)
+    ).scalars().all()
+    recount_booking_dates(db, set(dates))
+    db.commit()
+    invalidate_slot_dates(*set(dates))
+    return len(dates)
+
 def check_slot_booked(db: Session, target_date: date, start_time: time, end_time: time) -> bool:
     """
     Check if a slot is already booked for a given date and time range.
@@ -0,0 +1,249 @@
+"""
+Bulk booking export and import.
+
+Exports stream rows from a server-side cursor and encode them chunk by
+chunk, so memory stays flat regardless of the number of bookings. Imports
+validate a CSV row by row, load the valid rows into a temporary staging
+table (through COPY on Postgres) and merge them into `bookings` with a
+single INSERT ... SELECT that skips unknown patients and taken slots.
+"""
+
+import csv
+import io
+import json
+import tempfile
+from datetime import date, datetime
+from typing import Iterable, Iterator, TextIO
+from sqlalchemy import (
+    Column, Date, Integer, MetaData, String, Table, Time, select, text
+)
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from ..models.booking import Booking, ACTIVE_BOOKING_STATUSES, BOOKING_STATUSES
+from ..models.user import User
+from ..core.slot_engine import parse_hhmm, to_time
+from ..schemas.availability import AvailabilityCreate
+from .slot import refresh_slot_inventory
+from .stats import rebuild_booking_counters
+
+EXPORT_COLUMNS = (
+    "id", "user_id", "patient_name", "patient_email", "patient_phone",
+    "date", "start_time", "end_time", "status", "created_at",
+)
+EXPORT_BATCH_SIZE = 2000
+IMPORT_BATCH_SIZE = 5000
+MAX_REPORTED_ERRORS = 20
+
+# Session-local staging table; kept out of Base.metadata so create_all never creates it
+_staging = Table(
+    "booking_import", MetaData(),
+    Column("line", Integer),
+    Column("user_id", Integer),
+    Column("user_email", String),
+    Column("date", Date),
+    Column("start_time", Time),
+    Column("end_time", Time),
+    Column("status", String),
+    prefixes=["TEMPORARY"],
+)
+
+_ACTIVE_SQL = ", ".join(f"'{s}'" for s in ACTIVE_BOOKING_STATUSES)
+
+_RESOLVE_EMAILS = """
+UPDATE booking_import SET user_id = u.id
+FROM users u
+WHERE booking_import.user_id IS NULL AND lower(u.email) = lower(booking_import.user_email)
+"""
+
+# Rows overlapping an existing active booking are skipped; rows of the same
+# import starting at the same time are deduplicated by uq_bookings_active_slot
+_MERGE = f"""
+INSERT INTO bookings (user_id, date, start_time, end_time, status, created_at)
+SELECT u.id, s.date, s.start_time, s.end_time, s.status, :created_at
+FROM booking_import s
+JOIN users u ON u.id = s.user_id
+WHERE s.status NOT IN ({_ACTIVE_SQL}) OR NOT EXISTS (
+    SELECT 1 FROM bookings b
+    WHERE b.date = s.date
+      AND b.status IN ({_ACTIVE_SQL})
+      AND b.start_time < s.end_time
+      AND b.end_time > s.start_time
+)
+ON CONFLICT DO NOTHING
+"""
+
+
+# Export
+
+def export_statement(date_from: date | None = None, date_to: date | None = None, status: str | None = None):
+    """
+    Build the export query, ordered like the admin booking list.
+    """
+    stmt = (
+        select(
+            Booking.id, Booking.user_id, User.name, User.email, User.phone_number,
+            Booking.date, Booking.start_time, Booking.end_time, Booking.status, Booking.created_at
+        )
+        .join(User, User.id == Booking.user_id)
+        .order_by(Booking.date, Booking.start_time, Booking.id)
+    )
+    if date_from:
+        stmt = stmt.where(Booking.date >= date_from)
+    if date_to:
+        stmt = stmt.where(Booking.date <= date_to)
+    if status:
+        stmt = stmt.where(Booking.status == status)
+    return stmt
+
+def stream_export_rows(engine: Engine, stmt) -> Iterator[tuple]:
+    """
+    Yield export rows from a server-side cursor on a dedicated connection.
+    """
+    with engine.connect() as connection:
+        result = connection.execution_options(stream_results=True, yield_per=EXPORT_BATCH_SIZE).execute(stmt)
+        for row in result:
+            yield tuple(row)
+
+def _export_value(value):
+    if value is None:
+        return ""
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return value
+
+def iter_csv(rows: Iterable[tuple]) -> Iterator[str]:
+    """
+    Encode export rows as CSV, one chunk per EXPORT_BATCH_SIZE rows.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_COLUMNS)
+    for i, row in enumerate(rows, 1):
+        writer.writerow([_export_value(v) for v in row])
+        if i % EXPORT_BATCH_SIZE == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+def iter_ndjson(rows: Iterable[tuple]) -> Iterator[str]:
+    """
+    Encode export rows as newline-delimited JSON, one chunk per EXPORT_BATCH_SIZE rows.
+    """
+    chunk = []
+    for row in rows:
+        chunk.append(json.dumps(dict(zip(EXPORT_COLUMNS, map(_export_value, row))), ensure_ascii=False))
+        if len(chunk) == EXPORT_BATCH_SIZE:
+            yield "\n".join(chunk) + "\n"
+            chunk = []
+    if chunk:
+        yield "\n".join(chunk) + "\n"
+
+
+# Import
+
+def _parse_time(value: str):
+    value = value.strip()
+    if value[-2:].lower() in ("am", "pm"):
+        return AvailabilityCreate.parse_time_string(value)
+    # 'HH:MM', or 'HH:MM:SS' as written by the export
+    return to_time(parse_hhmm(value[:5]))
+
+def _validated_rows(source: TextIO, errors: list[str], counts: dict) -> Iterator[tuple]:
+    """
+    Parse and validate CSV rows, yielding staging tuples and recording errors.
+    Accepted columns: user_id or patient_email, date (YYYY-MM-DD),
+    start_time and end_time ('HH:MM' or 'HH:MM AM/PM'), optional status.
+    """
+    reader = csv.DictReader(source)
+    for line, record in enumerate(reader, 2):
+        counts["read"] += 1
+        try:
+            user_id = (record.get("user_id") or "").strip()
+            email = (record.get("patient_email") or record.get("email") or "").strip()
+            if not user_id and not email:
+                raise ValueError("user_id or patient_email is required")
+            day = date.fromisoformat((record.get("date") or "").strip())
+            start_time = _parse_time(record.get("start_time") or "")
+            end_time = _parse_time(record.get("end_time") or "")
+            if end_time <= start_time:
+                raise ValueError("end_time must be after start_time")
+            status = (record.get("status") or "booked").strip().lower()
+            if status not in BOOKING_STATUSES:
+                raise ValueError(f"unknown status '{status}'")
+            yield (line, int(user_id) if user_id else None, email or None, day, start_time, end_time, status)
+        except (ValueError, TypeError) as e:
+            counts["invalid"] += 1
+            if len(errors) < MAX_REPORTED_ERRORS:
+                errors.append(f"line {line}: {e}")
+
+def _copy_into_staging(db: Session, rows: Iterable[tuple]) -> None:
+    """
+    Load staging rows with COPY, spooling them to disk beyond a few megabytes.
+    """
+    with tempfile.SpooledTemporaryFile(max_size=8 * 1024 * 1024, mode="w+", newline="") as spool:
+        writer = csv.writer(spool)
+        for row in rows:
+            writer.writerow(["" if v is None else _export_value(v) for v in row])
+        spool.seek(0)
+        cursor = db.connection().connection.cursor()
+        try:
+            cursor.copy_expert(
+                "COPY booking_import (line, user_id, user_email, date, start_time, end_time, status) "
+                "FROM STDIN WITH (FORMAT csv)",
+                spool
+            )
+        finally:
+            cursor.close()
+
+def _insert_into_staging(db: Session, rows: Iterable[tuple]) -> None:
+    batch = []
+    for row in rows:
+        batch.append(dict(zip(("line", "user_id", "user_email", "date", "start_time", "end_time", "status"), row)))
+        if len(batch) == IMPORT_BATCH_SIZE:
+            db.execute(_staging.insert(), batch)
+            batch = []
+    if batch:
+        db.execute(_staging.insert(), batch)
+
+def import_bookings(db: Session, source: TextIO) -> dict:
+    """
+    Bulk-import bookings from CSV.
+    Valid rows are staged and merged in one transaction; rows whose patient
+    does not exist or whose time overlaps an active booking are skipped.
+    Booking counters and the slot inventory are rebuilt afterwards.
+    Args:
+        db (Session): SQLAlchemy session
+        source (TextIO): CSV text with a header row
+    Returns:
+        dict: Row counts and the first validation errors
+    """
+    errors: list[str] = []
+    counts = {"read": 0, "invalid": 0}
+    connection = db.connection()
+    _staging.drop(connection, checkfirst=True)
+    _staging.create(connection)
+    try:
+        rows = _validated_rows(source, errors, counts)
+        if connection.dialect.name == "postgresql":
+            _copy_into_staging(db, rows)
+        else:
+            _insert_into_staging(db, rows)
+        db.execute(text(_RESOLVE_EMAILS))
+        imported = db.execute(text(_MERGE), {"created_at": datetime.utcnow()}).rowcount
+    except Exception:
+        db.rollback()
+        raise
+    _staging.drop(db.connection())
+    db.commit()
+
+    if imported:
+        rebuild_booking_counters(db)
+        refresh_slot_inventory(db)
+    return {
+        "rows_read": counts["read"],
+        "rows_invalid": counts["invalid"],
+        "rows_imported": imported,
+        "rows_skipped": counts["read"] - counts["invalid"] - imported,
+        "errors": errors,
+    }
@@ -1,6 +1,7 @@
 from sqlalchemy.orm import Session
 from ..models.clinic_info import ClinicInfo
 from ..schemas.clinic_info import ClinicInfoIn
+from ..core.response_cache import response_cache, CACHE_CLINIC_INFO
 
 def get_clinic_info(db: Session):
     return db.query(ClinicInfo).first()
@@ -17,4 +18,5 @@ def update_clinic_info(db: Session, info: ClinicInfoIn):
         clinic_info.address = info.address
     db.commit()
     db.refresh(clinic_info)
+    response_cache.bump(CACHE_CLINIC_INFO)
     return clinic_info 
\ No newline at end of file
@@ -1,9 +1,22 @@
 from sqlalchemy.orm import Session
-from ..models.slider_image import SliderImage
+from sqlalchemy import update
+from datetime import datetime, timedelta
+from ..models.slider_image import (
+    SliderImage, UPLOAD_PENDING, UPLOAD_IN_PROGRESS, UPLOAD_READY, UPLOAD_FAILED
+)
 from ..schemas.slider_image import SliderImageCreate, SliderImageUpdate
+from ..core.response_cache import response_cache, CACHE_SLIDER
+from ..core.image_storage import static_url
 
-def get_slider_images(db: Session):
-    return db.query(SliderImage).order_by(SliderImage.order).all()
+def get_slider_images(db: Session, ready_only: bool = False):
+    """
+    Get slider images in display order; with ready_only, only the ones whose
+    upload completed (for the public slider).
+    """
+    query = db.query(SliderImage)
+    if ready_only:
+        query = query.filter(SliderImage.upload_status == UPLOAD_READY)
+    return query.order_by(SliderImage.order).all()
 
 def create_slider_image(db: Session, image_url: str, slider_data: SliderImageCreate):
     db_image = SliderImage(
@@ -15,6 +28,7 @@ def create_slider_image(db: Session, image_url: str, slider_data: SliderImageCre
     )
     db.add(db_image)
     db.commit()
+    response_cache.bump(CACHE_SLIDER)
     db.refresh(db_image)
     return db_image
 
@@ -25,6 +39,7 @@ def update_slider_image(db: Session, image_id: int, slider_data: SliderImageUpda
     for field, value in slider_data.dict(exclude_unset=True).items():
         setattr(db_image, field, value)
     db.commit()
+    response_cache.bump(CACHE_SLIDER)
     db.refresh(db_image)
     return db_image
 
@@ -34,4 +49,94 @@ def delete_slider_image(db: Session, image_id: int):
         return False
     db.delete(db_image)
     db.commit()
-    return True 
\ No newline at end of file
+    response_cache.bump(CACHE_SLIDER)
+    return True
+
+def create_pending_slider_image(
+    db: Session, title: str, description: str, upload_path: str, content_hash: str | None = None
+) -> SliderImage:
+    """
+    Create a slider image whose file is staged locally and not uploaded yet.
+    Admin listings show it from the staged file until the upload worker replaces
+    the URL; the public slider only lists it once the upload is complete.
+    """
+    db_image = SliderImage(
+        title=title,
+        description=description,
+        image_url=static_url(upload_path),
+        upload_status=UPLOAD_PENDING,
+        upload_path=upload_path,
+        content_hash=content_hash
+    )
+    db.add(db_image)
+    db.commit()
+    response_cache.bump(CACHE_SLIDER)
+    db.refresh(db_image)
+    return db_image
+
+def claim_slider_upload(db: Session, image_id: int) -> tuple[str, int, str | None] | None:
+    """
+    Atomically move a pending upload to 'uploading', so only one worker takes it.
+    Returns:
+        tuple | None: (staged path, attempt number, content hash), or None if not pending
+    """
+    row = db.execute(
+        update(SliderImage)
+        .where(SliderImage.id == image_id, SliderImage.upload_status == UPLOAD_PENDING)
+        .values(upload_status=UPLOAD_IN_PROGRESS, upload_attempts=SliderImage.upload_attempts + 1)
+        .returning(SliderImage.upload_path, SliderImage.upload_attempts, SliderImage.content_hash)
+        .execution_options(synchronize_session=False)
+    ).first()
+    db.commit()
+    return tuple(row) if row else None
+
+def complete_slider_upload(db: Session, image_id: int, image_url: str, variants: dict | None = None) -> None:
+    """
+    Point a slider image at its uploaded file and resized variants.
+    """
+    db.execute(
+        update(SliderImage)
+        .where(SliderImage.id == image_id, SliderImage.upload_status == UPLOAD_IN_PROGRESS)
+        .values(image_url=image_url, upload_status=UPLOAD_READY, upload_error=None, upload_path=None, **(variants or {}))
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+    response_cache.bump(CACHE_SLIDER)
+
+def fail_slider_upload(db: Session, image_id: int, error: str, retry: bool) -> None:
+    """
+    Record a failed upload attempt, leaving it pending for a retry or marking it failed.
+    A failed image no longer points at its staged file, which the caller deletes.
+    """
+    values = {"upload_status": UPLOAD_PENDING if retry else UPLOAD_FAILED, "upload_error": error[:500]}
+    if not retry:
+        values.update(image_url="", upload_path=None)
+    db.execute(
+        update(SliderImage)
+        .where(SliderImage.id == image_id, SliderImage.upload_status == UPLOAD_IN_PROGRESS)
+        .values(**values)
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+    if not retry:
+        response_cache.bump(CACHE_SLIDER)
+
+def unfinished_slider_uploads(db: Session, stale_seconds: int) -> list[int]:
+    """
+    Ids of uploads to (re)queue at startup: pending ones, and ones stuck
+    'uploading' for longer than stale_seconds, which are reset to pending.
+    """
+    db.execute(
+        update(SliderImage)
+        .where(
+            SliderImage.upload_status == UPLOAD_IN_PROGRESS,
+            SliderImage.updated_at < datetime.utcnow() - timedelta(seconds=stale_seconds)
+        )
+        .values(upload_status=UPLOAD_PENDING)
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+    return [
+        image_id for (image_id,) in
+        db.query(SliderImage.id).filter(SliderImage.upload_status == UPLOAD_PENDING).order_by(SliderImage.id)
+    ]
@@ -0,0 +1,219 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import func, insert, update
+from sqlalchemy.exc import IntegrityError
+from datetime import date, timedelta
+from ..core.config import settings
+from ..core.slot_cache import slot_cache
+from ..core.occupancy import occupancy_index
+from ..models.slot import Slot, SLOT_FREE, SLOT_BOOKED
+from ..models.booking import Booking, ACTIVE_BOOKING_STATUSES
+from ..core.slot_engine import Interval, occupancy, to_minutes, to_time
+
+# Last day the current process has verified the horizon for
+_horizon_checked_on: date | None = None
+
+
+def invalidate_slot_dates(*dates: date) -> None:
+    """
+    Drop the cached slots and occupancy bitmaps of dates whose bookings changed.
+    Call after the change is committed.
+    """
+    slot_cache.invalidate(*dates)
+    occupancy_index.invalidate(*dates)
+
+def invalidate_all_slot_dates() -> None:
+    slot_cache.invalidate_all()
+    occupancy_index.invalidate_all()
+
+def _booked_intervals(bookings: list[Booking]) -> dict[date, list[Interval]]:
+    booked: dict[date, list[Interval]] = {}
+    for b in bookings:
+        booked.setdefault(b.date, []).append((to_minutes(b.start_time), to_minutes(b.end_time)))
+    return booked
+
+def _booking_for(bookings: list[Booking], start: int, end: int) -> Booking | None:
+    for b in bookings:
+        if to_minutes(b.start_time) < end and to_minutes(b.end_time) > start:
+            return b
+    return None
+
+def rebuild_slots(db: Session, start_date: date, end_date: date) -> int:
+    """
+    Re-materialize the slot inventory for a date range (inclusive).
+    Existing rows in the range are replaced in a single transaction and
+    slots covered by an active booking are stored as booked.
+    Args:
+        db (Session): SQLAlchemy session
+        start_date (date): First date to rebuild
+        end_date (date): Last date to rebuild
+    Returns:
+        int: Number of slot rows written
+    """
+    from .availability import load_schedule
+    schedule = load_schedule(db)
+    bookings_by_date: dict[date, list[Booking]] = {}
+    for b in db.query(Booking).filter(
+        Booking.date >= start_date,
+        Booking.date <= end_date,
+        Booking.status.in_(ACTIVE_BOOKING_STATUSES)
+    ):
+        bookings_by_date.setdefault(b.date, []).append(b)
+
+    rows = []
+    current = start_date
+    while current <= end_date:
+        day_bookings = bookings_by_date.get(current, [])
+        for start, end in schedule.day_slots(current):
+            booking = _booking_for(day_bookings, start, end) if day_bookings else None
+            rows.append({
+                "date": current,
+                "start_time": to_time(start),
+                "end_time": to_time(end),
+                "state": SLOT_BOOKED if booking else SLOT_FREE,
+                "booking_id": booking.id if booking else None
+            })
+        current += timedelta(days=1)
+
+    db.query(Slot).filter(Slot.date >= start_date, Slot.date <= end_date).delete(synchronize_session=False)
+    if rows:
+        db.execute(insert(Slot), rows)
+    try:
+        db.commit()
+    except IntegrityError:
+        # Another worker materialized the same range concurrently
+        db.rollback()
+        return 0
+    finally:
+        invalidate_all_slot_dates()
+    return len(rows)
+
+def refresh_slot_inventory(db: Session) -> int:
+    """
+    Rebuild the whole horizon, e.g. after availability or settings changes.
+    """
+    global _horizon_checked_on
+    today = date.today()
+    written = rebuild_slots(db, today, today + timedelta(days=settings.SLOT_HORIZON_DAYS - 1))
+    _horizon_checked_on = today
+    return written
+
+def ensure_slot_horizon(db: Session) -> None:
+    """
+    Extend the materialized inventory so it covers the rolling horizon.
+    Runs at most once per day per process; only missing days are generated.
+    """
+    global _horizon_checked_on
+    today = date.today()
+    if _horizon_checked_on == today:
+        return
+    horizon_end = today + timedelta(days=settings.SLOT_HORIZON_DAYS - 1)
+    last_date = db.query(func.max(Slot.date)).scalar()
+    if last_date is None or last_date < horizon_end:
+        start = today if last_date is None or last_date < today else last_date + timedelta(days=1)
+        rebuild_slots(db, start, horizon_end)
+    _horizon_checked_on = today
+
+def horizon_is_current() -> bool:
+    """
+    Whether this process already verified the horizon today.
+    """
+    return _horizon_checked_on == date.today()
+
+def in_slot_horizon(target_date: date) -> bool:
+    today = date.today()
+    return today <= target_date < today + timedelta(days=settings.SLOT_HORIZON_DAYS)
+
+def get_slots_for_date(db: Session, target_date: date) -> list[tuple[int, int, str]]:
+    """
+    Get all slots of a date with their state.
+    Dates inside the horizon are a single indexed range scan on the inventory;
+    dates outside it are computed by the slot engine.
+    Args:
+        db (Session): SQLAlchemy session
+        target_date (date): Date to look up
+    Returns:
+        list[tuple[int, int, str]]: (start, end, state) tuples in minutes, ordered by start
+    """
+    if in_slot_horizon(target_date):
+        ensure_slot_horizon(db)
+        return [
+            (to_minutes(row.start_time), to_minutes(row.end_time), row.state)
+            for row in db.query(Slot.start_time, Slot.end_time, Slot.state)
+            .filter(Slot.date == target_date)
+            .order_by(Slot.start_time)
+        ]
+    from .availability import load_schedule
+    bookings = db.query(Booking).filter(
+        Booking.date == target_date,
+        Booking.status.in_(ACTIVE_BOOKING_STATUSES)
+    ).all()
+    booked = _booked_intervals(bookings).get(target_date, [])
+    return [
+        (start, end, SLOT_BOOKED if is_booked else SLOT_FREE)
+        for start, end, is_booked in occupancy(load_schedule(db), target_date, booked)
+    ]
+
+def get_free_slots(db: Session, target_date: date) -> list[Interval]:
+    """
+    Get the free slots of a date as (start, end) tuples in minutes.
+    """
+    return [(start, end) for start, end, state in get_slots_for_date(db, target_date) if state == SLOT_FREE]
+
+def claim_slots(db: Session, booking: Booking) -> int:
+    """
+    Mark the inventory slots covered by a booking as booked.
+    Does not commit; callers run it in the booking's own transaction.
+    Returns:
+        int: Number of slots claimed
+    """
+    return db.query(Slot).filter(
+        Slot.date == booking.date,
+        Slot.start_time < booking.end_time,
+        Slot.end_time > booking.start_time,
+        Slot.state == SLOT_FREE
+    ).update({Slot.state: SLOT_BOOKED, Slot.booking_id: booking.id}, synchronize_session=False)
+
+def covered_slot_count(db: Session, booking: Booking) -> int:
+    """
+    Number of the schedule's slots a booking covers, i.e. how many
+    claim_slots must claim when none of them is taken.
+    """
+    from .availability import load_schedule
+    start, end = to_minutes(booking.start_time), to_minutes(booking.end_time)
+    return sum(1 for s, e in load_schedule(db).day_slots(booking.date) if s < end and e > start)
+
+def release_slots(db: Session, booking: Booking) -> int:
+    """
+    Free the inventory slots held by a booking.
+    Does not commit; callers run it in the booking's own transaction.
+    Returns:
+        int: Number of slots released
+    """
+    return db.query(Slot).filter(Slot.booking_id == booking.id).update(
+        {Slot.state: SLOT_FREE, Slot.booking_id: None}, synchronize_session=False
+    )
+
+def release_slots_of(db: Session, booking_ids) -> int:
+    """
+    Free the inventory slots held by a set of bookings in one UPDATE.
+    Does not commit; callers run it in the write's own transaction.
+    Args:
+        db (Session): SQLAlchemy session
+        booking_ids: Select of booking ids, or a list of ids
+    Returns:
+        int: Number of slots released
+    """
+    return db.execute(
+        update(Slot).where(Slot.booking_id.in_(booking_ids))
+        .values(state=SLOT_FREE, booking_id=None)
+        .execution_options(synchronize_session=False)
+    ).rowcount
+
+def resync_booking_slots(db: Session, booking: Booking) -> None:
+    """
+    Re-point the inventory after a booking's date, times or status changed.
+    Does not commit; callers run it in the booking's own transaction.
+    """
+    release_slots(db, booking)
+    if booking.status in ACTIVE_BOOKING_STATUSES:
+        claim_slots(db, booking)
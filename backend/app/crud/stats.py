@@ -0,0 +1,113 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import func, case, insert, select, delete
+from sqlalchemy.dialects import postgresql, sqlite
+from datetime import date, timedelta
+from ..models.booking import Booking
+from ..models.booking_counter import BookingCounter
+
+BookingKey = tuple[date, str]
+
+
+def _upsert(db: Session):
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        return postgresql.insert(BookingCounter)
+    if dialect == "sqlite":
+        return sqlite.insert(BookingCounter)
+    return None
+
+def bump_booking_counter(db: Session, day: date, status: str, delta: int) -> None:
+    """
+    Add delta to the counter of a (date, status) pair.
+    Does not commit; callers run it in the booking's own transaction.
+    """
+    stmt = _upsert(db)
+    if stmt is not None:
+        stmt = stmt.values(date=day, status=status, count=delta)
+        db.execute(stmt.on_conflict_do_update(
+            index_elements=[BookingCounter.date, BookingCounter.status],
+            set_={"count": BookingCounter.count + delta}
+        ))
+        return
+    updated = db.query(BookingCounter).filter(
+        BookingCounter.date == day, BookingCounter.status == status
+    ).update({BookingCounter.count: BookingCounter.count + delta}, synchronize_session=False)
+    if not updated:
+        db.add(BookingCounter(date=day, status=status, count=delta))
+
+def count_booking_change(db: Session, before: BookingKey | None, after: BookingKey | None) -> None:
+    """
+    Record a booking moving from one (date, status) to another.
+    Pass None as `before` for a new booking and as `after` for a deleted one.
+    Does not commit; callers run it in the booking's own transaction.
+    """
+    if before == after:
+        return
+    if before is not None:
+        bump_booking_counter(db, before[0], before[1], -1)
+    if after is not None:
+        bump_booking_counter(db, after[0], after[1], 1)
+
+def recount_booking_dates(db: Session, dates: set[date]) -> None:
+    """
+    Recompute the counters of the given dates from the bookings table, for
+    set-based writes that do not know each row's previous status.
+    Does not commit; callers run it in the write's own transaction.
+    """
+    if not dates:
+        return
+    db.execute(delete(BookingCounter).where(BookingCounter.date.in_(dates)))
+    db.execute(insert(BookingCounter).from_select(
+        ["date", "status", "count"],
+        select(Booking.date, Booking.status, func.count(Booking.id))
+        .where(Booking.date.in_(dates))
+        .group_by(Booking.date, Booking.status)
+    ))
+
+def rebuild_booking_counters(db: Session) -> None:
+    """
+    Recompute every counter from the bookings table with one grouped aggregate.
+    """
+    rows = db.query(Booking.date, Booking.status, func.count(Booking.id)).group_by(Booking.date, Booking.status).all()
+    db.query(BookingCounter).delete(synchronize_session=False)
+    if rows:
+        db.execute(insert(BookingCounter), [
+            {"date": day, "status": status, "count": count} for day, status, count in rows
+        ])
+    db.commit()
+
+def get_booking_stats(db: Session, today: date | None = None) -> dict[str, dict[str, int]]:
+    """
+    Get booking counts per status for all time, today and the current week.
+    Reads only the small counters table, in a single grouped query.
+    Args:
+        db (Session): SQLAlchemy session
+        today (date | None): Reference day, defaults to date.today()
+    Returns:
+        dict: {"total": {status: n}, "today": {status: n}, "week": {status: n}}
+    """
+    today = today or date.today()
+    week_start = today - timedelta(days=today.weekday())
+    week_end = week_start + timedelta(days=6)
+
+    def query():
+        return db.query(
+            BookingCounter.status,
+            func.sum(BookingCounter.count),
+            func.sum(case((BookingCounter.date == today, BookingCounter.count), else_=0)),
+            func.sum(case((BookingCounter.date.between(week_start, week_end), BookingCounter.count), else_=0))
+        ).group_by(BookingCounter.status).all()
+
+    rows = query()
+    if not rows and db.query(Booking.id).first() is not None:
+        # Counters were never populated for an existing database
+        rebuild_booking_counters(db)
+        rows = query()
+    stats = {"total": {}, "today": {}, "week": {}}
+    for status, total, today_count, week_count in rows:
+        if not total:
+            continue
+        stats["total"][status] = int(total or 0)
+        stats["today"][status] = int(today_count or 0)
+        stats["week"][status] = int(week_count or 0)
+    return stats
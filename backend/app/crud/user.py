@@ -1,7 +1,13 @@
 from sqlalchemy.orm import Session
 from ..models.user import User, ROLE_PATIENT, ROLE_ADMIN
 from ..auth.security import hash_password, verify_password
+from ..auth.user_cache import user_cache
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy import func, literal_column, update
+import re
+
+# Queries made only of these characters are treated as phone numbers
+PHONE_QUERY_PATTERN = re.compile(r'^[\d\s()+-]+$')
 
 def create_patient_user(db: Session, name: str, email: str, phone_number: str, age: int, gender: str, password: str) -> User:
     """
@@ -98,15 +104,109 @@ def authenticate_user(db: Session, email: str, password: str) -> User:
         return None
     return user
 
+def get_users_page(db: Session, limit: int, after_id: int | None = None, role: str | None = None) -> tuple[list[User], int | None]:
+    """
+    Get one page of users ordered by id.
+    Args:
+        db (Session): SQLAlchemy session
+        limit (int): Maximum number of users to return
+        after_id (int | None): ID of the last user of the previous page
+        role (str | None): Optional role filter
+    Returns:
+        tuple: The users and the id to continue after, or None on the last page
+    """
+    query = db.query(User)
+    if role:
+        query = query.filter(User.role == role)
+    if after_id is not None:
+        query = query.filter(User.id > after_id)
+    rows = query.order_by(User.id).limit(limit + 1).all()
+    if len(rows) <= limit:
+        return rows, None
+    return rows[:limit], rows[limit - 1].id
+
+def normalize_phone(value: str) -> str:
+    """
+    Strip everything but digits from a phone number.
+    """
+    return re.sub(r'\D', '', value)
+
+def _is_postgres(db: Session) -> bool:
+    return db.get_bind().dialect.name == "postgresql"
+
+def _phone_digits(db: Session):
+    """
+    SQL expression for the digits-only phone number (matches ix_users_phone_digits).
+    """
+    if _is_postgres(db):
+        # Rendered literally so the planner matches the expression index
+        return literal_column("regexp_replace(users.phone_number, '[^0-9]', '', 'g')")
+    expr = User.phone_number
+    for char in (' ', '-', '+', '(', ')'):
+        expr = func.replace(expr, char, '')
+    return expr
+
+def user_search_criteria(db: Session, q: str):
+    """
+    Build the WHERE clause for a patient search.
+    Digits-only queries are prefix lookups on the normalized phone number;
+    other queries match name or email, fuzzily on PostgreSQL (trigram indexes).
+    Args:
+        db (Session): SQLAlchemy session
+        q (str): Search text
+    Returns:
+        The SQL criteria on User
+    """
+    q = q.strip()
+    digits = normalize_phone(q)
+    if digits and PHONE_QUERY_PATTERN.match(q):
+        return _phone_digits(db).like(f"{digits}%")
+    pattern = f"%{q}%"
+    criteria = User.name.ilike(pattern) | User.email.ilike(pattern)
+    if _is_postgres(db):
+        criteria = criteria | User.name.op('%')(q)
+    return criteria
+
+def user_search_rank(db: Session, q: str):
+    """
+    SQL expression ranking search matches (higher is better), or None when
+    ranking is not available (non-PostgreSQL databases and phone lookups).
+    """
+    q = q.strip()
+    if not _is_postgres(db) or PHONE_QUERY_PATTERN.match(q):
+        return None
+    return func.greatest(func.similarity(User.name, q), func.similarity(User.email, q))
+
+def search_users(db: Session, q: str, limit: int = 20) -> list[User]:
+    """
+    Search users by name, email or phone number, best matches first.
+    Args:
+        db (Session): SQLAlchemy session
+        q (str): Search text
+        limit (int): Maximum number of users to return
+    Returns:
+        list[User]: Matching users
+    """
+    query = db.query(User).filter(user_search_criteria(db, q))
+    rank = user_search_rank(db, q)
+    if rank is not None:
+        query = query.order_by(rank.desc(), User.id)
+    else:
+        query = query.order_by(User.name, User.id)
+    return query.limit(limit).all()
+
 def update_user(db: Session, user_id: int, user_update: dict) -> User:
     user = db.query(User).filter(User.id == user_id).first()
     if not user:
         return None
     for field, value in user_update.items():
-        if value is not None and hasattr(user, field):
+        if value is not None and hasattr(user, field) and field != "token_version":
             setattr(user, field, value)
+    # Tokens issued before this change are rejected from now on (see auth.dependencies)
+    user.token_version = (user.token_version or 0) + 1
     db.commit()
     db.refresh(user)
+    user_cache.invalidate(user_id)
     return user
 
 def delete_user(db: Session, user_id: int) -> bool:
@@ -115,4 +215,30 @@ def delete_user(db: Session, user_id: int) -> bool:
         return False
     db.delete(user)
     db.commit()
-    return True 
\ No newline at end of file
+    user_cache.invalidate(user_id)
+    return True
+
+def batch_update_users(db: Session, user_ids: list[int], fields: dict) -> int:
+    """
+    Apply the same field values to many users with one UPDATE ... RETURNING.
+    Bumps each user's token_version and drops them from the principal cache.
+    Args:
+        db (Session): SQLAlchemy session
+        user_ids (list[int]): Users to update
+        fields (dict): Values to set; None values are ignored
+    Returns:
+        int: Number of users updated
+    """
+    values = {field: value for field, value in fields.items() if value is not None}
+    if not user_ids or not values:
+        return 0
+    values["token_version"] = User.token_version + 1
+    updated = db.execute(
+        update(User).where(User.id.in_(user_ids)).values(**values)
+        .returning(User.id)
+        .execution_options(synchronize_session=False)
+    ).scalars().all()
+    db.commit()
+    for user_id in updated:
+        user_cache.invalidate(user_id)
+    return len(updated)
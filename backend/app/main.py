@@ -1,8 +1,16 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
+import time
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
-from .core.database import engine, Base
-from .models import user, availability, booking, slider_image, clinic_info
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from .core.database import engine, Base, PRIMARY_PIN_COOKIE, PRIMARY_PIN_HEADER
+from .core.config import settings
+from .core.pagination import NEXT_CURSOR_HEADER
+from .core.upload_worker import upload_worker
+from .core.static_files import CachedStaticFiles
+from .core.upload_limits import UploadSizeLimitMiddleware, MULTIPART_OVERHEAD_BYTES
+from .auth.security import HashingOverloadedError
+from .models import user, availability, booking, slider_image, clinic_info, slot, booking_counter
 from .routes import auth, availability as availability_routes, booking as booking_routes
 from .routes import admin as admin_routes
 from .routes import slider as slider_routes
@@ -33,16 +41,79 @@ allowed_origins = [
     "https://your-frontend-domain.com",  # Replace with your actual frontend domain
 ]
 
+# Stop oversized slider uploads while they are still arriving
+app.add_middleware(
+    UploadSizeLimitMiddleware,
+    max_body_bytes=settings.MAX_UPLOAD_BYTES + MULTIPART_OVERHEAD_BYTES,
+    route_names=("create_slider_image", "create_slider_image_alt"),
+)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=allowed_origins,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, PRIMARY_PIN_HEADER],
 )
 
+@app.on_event("startup")
+async def start_upload_worker():
+    await upload_worker.start()
+
+@app.on_event("shutdown")
+async def stop_upload_worker():
+    await upload_worker.stop()
+
+@app.exception_handler(HashingOverloadedError)
+async def hashing_overloaded_handler(request: Request, exc: HashingOverloadedError):
+    """
+    Shed login/registration load when the password hashing pool is saturated.
+    """
+    return JSONResponse(
+        status_code=503,
+        content={"detail": str(exc)},
+        headers={"Retry-After": str(exc.retry_after)},
+    )
+
+@app.exception_handler(PoolTimeoutError)
+async def pool_timeout_handler(request: Request, exc: PoolTimeoutError):
+    """
+    Answer 503 instead of 500 when no database connection frees up in time.
+    """
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Server is busy, please retry shortly"},
+        headers={"Retry-After": str(settings.DB_POOL_RETRY_AFTER_SECONDS)},
+    )
+
+READ_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+@app.middleware("http")
+async def pin_writers_to_primary(request: Request, call_next):
+    """
+    After a successful write, route the client's reads to the primary for a
+    short while so it reads its own writes despite replica lag. The pin is
+    returned in the X-Primary-Pin header, which cross-origin clients such as
+    the Angular app echo back on their next requests (cookies are not sent
+    on their credential-less cross-origin calls), and as a cookie for
+    same-origin clients.
+    """
+    response = await call_next(request)
+    if settings.REPLICA_DATABASE_URL and request.method not in READ_METHODS and response.status_code < 400:
+        pin = str(int(time.time()) + settings.PRIMARY_PIN_SECONDS)
+        response.headers[PRIMARY_PIN_HEADER] = pin
+        response.set_cookie(
+            PRIMARY_PIN_COOKIE,
+            pin,
+            max_age=settings.PRIMARY_PIN_SECONDS,
+            httponly=True,
+            samesite="lax",
+        )
+    return response
+
 # Mount static files for slider images
-app.mount("/static", StaticFiles(directory="static"), name="static")
+app.mount("/static", CachedStaticFiles(directory="static"), name="static")
 
 app.include_router(auth.router)
 app.include_router(availability_routes.router)
@@ -1,2 +1,2 @@
-from . import user, availability, booking, slider_image, clinic_info
+from . import user, availability, booking, slider_image, clinic_info, slot, booking_counter
 
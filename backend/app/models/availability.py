@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Time, Boolean, DateTime, JSON
+from sqlalchemy import Column, Integer, String, Time, Boolean, DateTime, JSON, ForeignKey, DDL, event
 from datetime import datetime
 from ..core.database import Base
 
@@ -25,6 +25,7 @@ class Availability(Base):
 class BookingSettings(Base):
     """
     SQLAlchemy model for booking settings (slot duration and working hours per day).
+    Rows are immutable versions; ScheduleState points at the one in effect.
     Fields:
         id: Primary key
         slot_duration: Duration of each booking slot in minutes
@@ -38,4 +39,30 @@ class BookingSettings(Base):
     slot_duration = Column(Integer, nullable=False, default=30)  # minutes
     working_hours = Column(JSON, nullable=False)  # {"Monday": {"enabled": true, "start": "09:00", "end": "17:00"}, ...}
     created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow) 
\ No newline at end of file
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+SCHEDULE_STATE_ID = 1
+
+class ScheduleState(Base):
+    """
+    Single-row pointer to the booking settings version in effect.
+    Fields:
+        id: Always SCHEDULE_STATE_ID
+        current_settings_id: BookingSettings version in effect (None before the first save)
+        version: Incremented by every settings save and availability change, so
+            each process knows when to recompile its cached schedule
+        updated_at: Last change timestamp
+    """
+    __tablename__ = "schedule_state"
+
+    id = Column(Integer, primary_key=True)
+    current_settings_id = Column(Integer, ForeignKey("booking_settings.id"), nullable=True)
+    version = Column(Integer, nullable=False, default=0, server_default="0")
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+# The pointer row always exists, so writers only ever UPDATE it
+event.listen(
+    ScheduleState.__table__,
+    "after_create",
+    DDL(f"INSERT INTO schedule_state (id, version) VALUES ({SCHEDULE_STATE_ID}, 0)")
+)
@@ -1,8 +1,12 @@
-from sqlalchemy import Column, Integer, ForeignKey, Date, Time, String, DateTime
+from sqlalchemy import Column, Integer, ForeignKey, Date, Time, String, DateTime, Index, DDL, event
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from ..core.database import Base
 
+# Statuses that occupy a slot; cancelled bookings free it again
+ACTIVE_BOOKING_STATUSES = ("booked", "confirmed", "pending")
+BOOKING_STATUSES = ACTIVE_BOOKING_STATUSES + ("cancelled", "completed")
+
 class Booking(Base):
     """
     SQLAlchemy model for patient bookings.
@@ -25,4 +29,33 @@ class Booking(Base):
     status = Column(String, default="booked")
     created_at = Column(DateTime, default=datetime.utcnow)
 
-    user = relationship("User") 
\ No newline at end of file
+    user = relationship("User")
+
+    __table_args__ = (
+        # At most one active booking may start at a given date and time
+        Index(
+            "uq_bookings_active_slot", date, start_time, unique=True,
+            postgresql_where=status.in_(ACTIVE_BOOKING_STATUSES),
+            sqlite_where=status.in_(ACTIVE_BOOKING_STATUSES),
+        ),
+        # Sort key of the keyset-paginated admin booking list
+        Index("ix_bookings_date_start_time_id", date, start_time, id),
+    )
+
+# Active bookings of a date may not overlap (PostgreSQL only). Inside the slot
+# horizon conflicting inserts already collide on their inventory slots; this
+# also covers dates beyond it, where there are no slot rows to claim, and
+# rejects the losing insert of two concurrent overlapping bookings.
+BOOKING_OVERLAP_DDL = """
+DO $$
+BEGIN
+    IF NOT EXISTS (SELECT 1 FROM pg_constraint WHERE conname = 'ex_bookings_active_overlap') THEN
+        ALTER TABLE bookings ADD CONSTRAINT ex_bookings_active_overlap
+        EXCLUDE USING gist (tsrange(date + start_time, date + end_time) WITH &&)
+        WHERE (status IN ('booked', 'confirmed', 'pending'));
+    END IF;
+END
+$$
+"""
+
+event.listen(Booking.__table__, "after_create", DDL(BOOKING_OVERLAP_DDL).execute_if(dialect="postgresql"))
@@ -0,0 +1,16 @@
+from sqlalchemy import Column, Integer, Date, String
+from ..core.database import Base
+
+class BookingCounter(Base):
+    """
+    SQLAlchemy model for incrementally maintained booking counts.
+    Fields:
+        date: Date of the bookings counted
+        status: Booking status counted
+        count: Number of bookings with that date and status
+    """
+    __tablename__ = "booking_counters"
+
+    date = Column(Date, primary_key=True)
+    status = Column(String, primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
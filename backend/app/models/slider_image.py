@@ -2,6 +2,13 @@ from sqlalchemy import Column, Integer, String, DateTime
 from datetime import datetime
 from ..core.database import Base
 
+# Upload states: accepted and staged locally, being pushed to the image
+# backend, served from the backend, or given up after UPLOAD_MAX_ATTEMPTS
+UPLOAD_PENDING = "pending"
+UPLOAD_IN_PROGRESS = "uploading"
+UPLOAD_READY = "ready"
+UPLOAD_FAILED = "failed"
+
 class SliderImage(Base):
     __tablename__ = "slider_images"
     id = Column(Integer, primary_key=True, index=True)
@@ -10,4 +17,14 @@ class SliderImage(Base):
     image_url = Column(String, nullable=False)
     order = Column(Integer, nullable=True, default=0)
     created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow) 
\ No newline at end of file
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    upload_status = Column(String, nullable=False, default=UPLOAD_READY, server_default=UPLOAD_READY)
+    upload_attempts = Column(Integer, nullable=False, default=0, server_default="0")
+    upload_error = Column(String, nullable=True)
+    # Staged local file while the upload is not finished
+    upload_path = Column(String, nullable=True)
+    # SHA-256 prefix of the uploaded bytes, naming the resized variants
+    content_hash = Column(String, nullable=True)
+    # Resized variants as <img srcset> values (WebP, and JPEG as fallback)
+    srcset = Column(String, nullable=True)
+    srcset_jpeg = Column(String, nullable=True)
@@ -0,0 +1,30 @@
+from sqlalchemy import Column, Integer, ForeignKey, Date, Time, String, UniqueConstraint
+from ..core.database import Base
+
+SLOT_FREE = "free"
+SLOT_BOOKED = "booked"
+
+class Slot(Base):
+    """
+    SQLAlchemy model for the materialized slot inventory.
+    One row per bookable slot, generated ahead of time for a rolling horizon
+    from the doctor's availability and kept in sync by the booking write paths.
+    Fields:
+        id: Primary key
+        date: Date of the slot
+        start_time: Start time of the slot
+        end_time: End time of the slot
+        state: Slot state ('free' or 'booked')
+        booking_id: Booking occupying the slot, if any
+    """
+    __tablename__ = "slots"
+    __table_args__ = (
+        UniqueConstraint("date", "start_time", name="uq_slots_date_start_time"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    date = Column(Date, nullable=False)
+    start_time = Column(Time, nullable=False)
+    end_time = Column(Time, nullable=False)
+    state = Column(String, nullable=False, default=SLOT_FREE)
+    booking_id = Column(Integer, ForeignKey('bookings.id', ondelete="SET NULL"), nullable=True)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String
+from sqlalchemy import Column, Integer, String, DDL, event
 from ..core.database import Base
 
 ROLE_ADMIN = "admin"
@@ -16,6 +16,8 @@ class User(Base):
         gender: User's gender
         hashed_password: Hashed password string
         role: User role (admin or patient)
+        token_version: Incremented on every profile change; carried in access tokens,
+            which are rejected once it is older than the user's
         status: User status (active or inactive)
     """
     __tablename__ = "users"
@@ -28,4 +30,20 @@ class User(Base):
     gender = Column(String, nullable=False)
     hashed_password = Column(String, nullable=False)
     role = Column(String, nullable=False)
-    # status = Column(String, nullable=False, default='active')  # تم إلغاء الحقل 
\ No newline at end of file
+    token_version = Column(Integer, nullable=False, default=0, server_default="0")
+    # status = Column(String, nullable=False, default='active')  # تم إلغاء الحقل 
+
+# Search indexes for the admin patient lookup (PostgreSQL only): trigram
+# indexes for fuzzy name/email/phone matching and a digits-only phone
+# expression index for prefix lookups.
+SEARCH_INDEX_DDL = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE INDEX IF NOT EXISTS ix_users_name_trgm ON users USING gin (name gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS ix_users_email_trgm ON users USING gin (email gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS ix_users_phone_trgm ON users USING gin (phone_number gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS ix_users_phone_digits ON users "
+    "(regexp_replace(phone_number, '[^0-9]', '', 'g') text_pattern_ops)",
+]
+
+for _statement in SEARCH_INDEX_DDL:
+    event.listen(User.__table__, "after_create", DDL(_statement).execute_if(dialect="postgresql"))
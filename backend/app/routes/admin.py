@@ -1,23 +1,44 @@
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form
+from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form, Query, Response, Request
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from typing import List
-from ..core.database import get_db
-from ..models.user import User
-from ..models.booking import Booking
-from ..schemas.user import UserOut, UserUpdate
-from ..schemas.booking import BookingOut, BookingCreate, BookingUpdate
+from typing import List, Literal
+from datetime import date as date_type
+from ..core.database import get_db, get_read_db, pinned_to_primary, engine, async_engine, replica_engine, async_replica_engine
+from ..core.config import settings
+from ..core.db_pool import pool_stats
+from ..core.slot_cache import slot_cache
+from ..core.occupancy import occupancy_index
+from ..core.response_cache import response_cache, cached_response, CACHE_SLIDER, PRIVATE_CACHE_CONTROL
+from ..models.user import User, ROLE_ADMIN, ROLE_PATIENT
+from ..models.booking import Booking, ACTIVE_BOOKING_STATUSES, BOOKING_STATUSES
+from ..schemas.user import UserOut, UserPage, UserUpdate, UserBatchUpdate
+from ..schemas.booking import BookingOut, BookingPage, BookingCreate, BookingUpdate, BookingBatchFilter, BookingBatchStatus
 from ..schemas.availability import BookingSettingsCreate, BookingSettings
 from ..auth.dependencies import get_current_user
-from ..crud.availability import save_booking_settings, get_booking_settings
-from ..crud.booking import admin_delete_booking
+from ..auth.security import hashing_stats
+from ..auth.user_cache import user_cache
+from ..crud.availability import save_booking_settings, get_booking_settings, schedule_cache
+from ..crud.booking import (
+    has_overlapping_booking, admin_delete_booking, batch_update_booking_status, batch_delete_bookings,
+    search_bookings as crud_search_bookings, get_bookings_page, booking_cursor_key, parse_booking_cursor_key
+)
+from ..crud.slot import resync_booking_slots, invalidate_slot_dates
+from ..crud.stats import get_booking_stats, count_booking_change
+from ..crud.booking_io import export_statement, stream_export_rows, iter_csv, iter_ndjson, import_bookings
 from sqlalchemy import func
+from sqlalchemy.exc import IntegrityError
 from ..models.slider_image import SliderImage
 from ..schemas.slider_image import SliderImageCreate, SliderImageUpdate, SliderImageOut
-import os, shutil
-from app.cloudinary_utils import upload_image_to_cloudinary
+import io, os, shutil
+from fastapi.concurrency import run_in_threadpool
+from ..core.image_storage import UploadRejectedError, stage_upload
+from ..core.upload_worker import upload_worker
+from ..crud.slider_image import create_pending_slider_image
 from ..schemas.contact import ContactMessageIn, ContactMessageOut
 from ..models.contact import ContactMessageModel
-from ..crud.user import update_user as crud_update_user, delete_user as crud_delete_user
+from ..crud.user import update_user as crud_update_user, delete_user as crud_delete_user, batch_update_users, get_users_page, search_users as crud_search_users
+from ..core.fast_json import list_response, page_response
+from ..core.pagination import encode_cursor, decode_cursor, NEXT_CURSOR_HEADER, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
 
 router = APIRouter(prefix="/admin", tags=["admin"])
 
@@ -28,88 +49,203 @@ def verify_admin(current_user: User = Depends(get_current_user)):
 
 @router.get("/dashboard/stats")
 def get_dashboard_stats(db: Session = Depends(get_db), current_user: User = Depends(verify_admin)):
-    total_appointments = db.query(Booking).count()
-    from datetime import date
-    today_appointments = db.query(Booking).filter(Booking.date == date.today()).count()
-    new_patients = db.query(User).filter(User.role == "patient").count()
+    stats = get_booking_stats(db)
+    total_appointments = sum(stats["total"].values())
+    today_appointments = sum(stats["today"].values())
+    new_patients = db.query(func.count(User.id)).filter(User.role == "patient").scalar()
     revenue = total_appointments * 20  # مثال: كل حجز 20 دينار
-    pending_appointments = db.query(Booking).filter(Booking.status == "pending").count()
-    confirmed_appointments = db.query(Booking).filter(Booking.status == "confirmed").count()
     return {
         "totalAppointments": total_appointments,
         "todayAppointments": today_appointments,
+        "weekAppointments": sum(stats["week"].values()),
         "newPatients": new_patients,
         "revenue": revenue,
-        "pendingAppointments": pending_appointments,
-        "confirmedAppointments": confirmed_appointments
+        "pendingAppointments": stats["total"].get("pending", 0),
+        "confirmedAppointments": stats["total"].get("confirmed", 0),
+        "byStatus": stats
     }
 
-@router.get("/bookings", response_model=List[BookingOut])
+@router.get("/metrics")
+def get_metrics(current_user: User = Depends(verify_admin)):
+    """
+    In-process performance metrics of this worker.
+    """
+    return {
+        "password_hashing": hashing_stats(),
+        "user_cache": user_cache.stats(),
+        "response_cache": response_cache.stats(),
+        "schedule_cache": schedule_cache.stats(),
+        "slot_cache": slot_cache.stats(),
+        "occupancy_index": occupancy_index.stats(),
+        "image_uploads": upload_worker.stats(),
+        "db_pool": {
+            "sync": pool_stats(engine),
+            "async": pool_stats(async_engine),
+            **({
+                "replica_sync": pool_stats(replica_engine),
+                "replica_async": pool_stats(async_replica_engine),
+            } if replica_engine is not engine else {}),
+        },
+    }
+
+@router.get("/bookings", response_model=BookingPage)
 def get_all_bookings(
-    db: Session = Depends(get_db), 
+    response: Response,
+    db: Session = Depends(get_read_db), 
     current_user: User = Depends(verify_admin),
-    q: str | None = None
+    q: str | None = None,
+    date: date_type | None = None,
+    date_from: date_type | None = None,
+    date_to: date_type | None = None,
+    status: str | None = None,
+    upcoming: bool = False,
+    cursor: str | None = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE)
 ):
-    query = db.query(Booking)
-    
+    """
+    List bookings ordered by date and time, one page at a time.
+    The cursor for the next page is returned as `next_cursor` (and in the
+    X-Next-Cursor header); it is null on the last page.
+    """
+    try:
+        after = parse_booking_cursor_key(decode_cursor(cursor)) if cursor else None
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if date:
+        date_from = date_to = date
+    if upcoming:
+        date_from = max(date_from or date_type.today(), date_type.today())
     # If search query is provided, filter by phone number or patient name
-    if q:
-        query = query.join(User).filter(
-            (User.phone_number.ilike(f'%{q}%')) | 
-            (User.name.ilike(f'%{q}%'))
-        )
-    
-    bookings = query.all()
-    result = []
-    for b in bookings:
-        result.append({
-            "id": b.id,
-            "user": UserOut.from_orm(b.user),
-            "date": b.date,
-            "start_time": b.start_time.strftime('%I:%M %p'),
-            "end_time": b.end_time.strftime('%I:%M %p'),
-            "status": b.status,
-            "created_at": b.created_at
-        })
-    return result
+    bookings, next_key = get_bookings_page(
+        db, limit, after=after, q=q, date_from=date_from, date_to=date_to, status=status
+    )
+    next_cursor = encode_cursor(booking_cursor_key(next_key)) if next_key else None
+    headers = {NEXT_CURSOR_HEADER: next_cursor} if next_cursor else {}
+    response.headers.update(headers)
+    return page_response(bookings, next_cursor, BookingOut.row, BookingOut.from_booking, headers)
 
 @router.get("/bookings/search", response_model=List[BookingOut])
 def search_bookings(
     q: str,
-    db: Session = Depends(get_db), 
+    limit: int = Query(50, ge=1, le=MAX_PAGE_SIZE),
+    db: Session = Depends(get_read_db), 
     current_user: User = Depends(verify_admin)
 ):
-    """Search bookings by phone number or patient name"""
-    query = db.query(Booking).join(User).filter(
-        (User.phone_number.ilike(f'%{q}%')) | 
-        (User.name.ilike(f'%{q}%'))
+    """Search bookings by phone number, patient name or email"""
+    bookings = crud_search_bookings(db, q, limit)
+    return list_response(bookings, BookingOut.row, BookingOut.from_booking)
+
+@router.post("/bookings/batch/status")
+def batch_update_booking_status_endpoint(
+    batch: BookingBatchStatus,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(verify_admin)
+):
+    """
+    Set the status of all bookings matching ids, a date range or a status,
+    e.g. cancel a whole day, in a single statement.
+    """
+    if batch.set_status not in BOOKING_STATUSES:
+        raise HTTPException(status_code=400, detail=f"Unknown status '{batch.set_status}'")
+    try:
+        updated = batch_update_booking_status(
+            db, batch.set_status, ids=batch.ids, date_from=batch.date_from, date_to=batch.date_to, status=batch.status
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"updated": updated}
+
+@router.post("/bookings/batch/delete")
+def batch_delete_bookings_endpoint(
+    batch: BookingBatchFilter,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(verify_admin)
+):
+    """
+    Delete all bookings matching ids, a date range or a status in a single statement.
+    """
+    try:
+        deleted = batch_delete_bookings(
+            db, ids=batch.ids, date_from=batch.date_from, date_to=batch.date_to, status=batch.status
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"deleted": deleted}
+
+@router.get("/bookings/export")
+def export_bookings(
+    request: Request,
+    format: Literal["csv", "ndjson"] = "csv",
+    date_from: date_type | None = None,
+    date_to: date_type | None = None,
+    status: str | None = None,
+    current_user: User = Depends(verify_admin)
+):
+    """
+    Stream bookings as CSV or NDJSON, read from the replica unless the client is pinned.
+    """
+    source = engine if pinned_to_primary(request) else replica_engine
+    rows = stream_export_rows(source, export_statement(date_from, date_to, status))
+    if format == "ndjson":
+        body, media_type = iter_ndjson(rows), "application/x-ndjson"
+    else:
+        body, media_type = iter_csv(rows), "text/csv"
+    filename = f"bookings-{date_type.today().isoformat()}.{format}"
+    return StreamingResponse(
+        body, media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
     )
-    
-    bookings = query.all()
-    result = []
-    for b in bookings:
-        result.append({
-            "id": b.id,
-            "user": UserOut.from_orm(b.user),
-            "date": b.date,
-            "start_time": b.start_time.strftime('%I:%M %p'),
-            "end_time": b.end_time.strftime('%I:%M %p'),
-            "status": b.status,
-            "created_at": b.created_at
-        })
-    return result
 
-@router.get("/users", response_model=List[UserOut])
-def get_all_users(db: Session = Depends(get_db), current_user: User = Depends(verify_admin)):
-    users = db.query(User).all()
-    return [UserOut.from_orm(u) for u in users]
+@router.post("/bookings/import")
+def import_bookings_endpoint(
+    file: UploadFile = File(...),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(verify_admin)
+):
+    """
+    Bulk-import bookings from a CSV upload and report what was imported or skipped.
+    """
+    source = io.TextIOWrapper(file.file, encoding="utf-8-sig", newline="")
+    try:
+        return import_bookings(db, source)
+    except UnicodeDecodeError:
+        raise HTTPException(status_code=400, detail="File must be UTF-8 encoded CSV")
+    finally:
+        source.detach()
+
+@router.get("/users", response_model=UserPage)
+def get_all_users(
+    response: Response,
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(verify_admin),
+    role: str | None = None,
+    cursor: str | None = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE)
+):
+    """
+    List users ordered by id, one page at a time.
+    The cursor for the next page is returned as `next_cursor` (and in the
+    X-Next-Cursor header); it is null on the last page.
+    """
+    try:
+        after_id = int(decode_cursor(cursor)[0]) if cursor else None
+    except (ValueError, IndexError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    users, next_id = get_users_page(db, limit, after_id=after_id, role=role)
+    next_cursor = encode_cursor([next_id]) if next_id is not None else None
+    headers = {NEXT_CURSOR_HEADER: next_cursor} if next_cursor else {}
+    response.headers.update(headers)
+    return page_response(users, next_cursor, UserOut.row, UserOut.from_orm, headers)
 
 @router.get("/users/search", response_model=List[UserOut])
-def search_users(q: str, db: Session = Depends(get_db), current_user: User = Depends(verify_admin)):
-    users = db.query(User).filter(
-        (User.name.ilike(f"%{q}%")) | (User.email.ilike(f"%{q}%"))
-    ).all()
-    return [UserOut.from_orm(u) for u in users]
+def search_users(
+    q: str,
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(verify_admin)
+):
+    users = crud_search_users(db, q, limit)
+    return list_response(users, UserOut.row, UserOut.from_orm)
 
 @router.post("/booking-settings", response_model=BookingSettings)
 def save_booking_settings_endpoint(
@@ -121,7 +257,7 @@ def save_booking_settings_endpoint(
 
 @router.get("/booking-settings", response_model=BookingSettings)
 def get_booking_settings_endpoint(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(verify_admin)
 ):
     settings = get_booking_settings(db)
@@ -143,6 +279,7 @@ def update_booking_endpoint(
             detail="Booking not found"
         )
     
+    before = (booking.date, booking.status)
     # Convert string times to time objects
     from datetime import datetime
     if booking_update.start_time:
@@ -158,18 +295,25 @@ def update_booking_endpoint(
     if booking_update.status:
         setattr(booking, 'status', booking_update.status)
     
+    if booking.end_time <= booking.start_time:
+        db.rollback()
+        raise HTTPException(status_code=400, detail="End time must be after start time")
+    
+    try:
+        db.flush()
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Slot already booked")
+    resync_booking_slots(db, booking)
+    if booking.status in ACTIVE_BOOKING_STATUSES and has_overlapping_booking(db, booking):
+        db.rollback()
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Booking overlaps another booking")
+    count_booking_change(db, before, (booking.date, booking.status))
     db.commit()
+    invalidate_slot_dates(before[0], booking.date)
     db.refresh(booking)
     
-    return {
-        "id": booking.id,
-        "user": UserOut.from_orm(booking.user),
-        "date": booking.date,
-        "start_time": booking.start_time.strftime('%I:%M %p'),
-        "end_time": booking.end_time.strftime('%I:%M %p'),
-        "status": booking.status,
-        "created_at": booking.created_at
-    }
+    return BookingOut.from_booking(booking)
 
 @router.delete("/bookings/{booking_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_booking_endpoint(
@@ -184,75 +328,49 @@ def delete_booking_endpoint(
             detail="Booking not found"
         )
 
+def render_all_slider_images(db: Session) -> list[SliderImageOut]:
+    return [SliderImageOut.from_orm(image) for image in db.query(SliderImage).all()]
+
 @router.get("/slider", response_model=list[SliderImageOut])
-def get_slider_images(db: Session = Depends(get_db)):
-    return db.query(SliderImage).all()
+def get_slider_images(request: Request, db: Session = Depends(get_db)):
+    return cached_response(request, CACHE_SLIDER, "all", lambda: render_all_slider_images(db), PRIVATE_CACHE_CONTROL)
 
 @router.get("/slider-images", response_model=list[SliderImageOut])
-def get_slider_images_alt(db: Session = Depends(get_db)):
-    return db.query(SliderImage).all()
+def get_slider_images_alt(request: Request, db: Session = Depends(get_db)):
+    return cached_response(request, CACHE_SLIDER, "all", lambda: render_all_slider_images(db), PRIVATE_CACHE_CONTROL)
+
+async def accept_slider_upload(title: str, description: str, image: UploadFile, db: Session) -> SliderImage:
+    """
+    Stage an uploaded slider image and create its row in the pending state.
+    The upload worker pushes the file to the image backend in the background.
+    """
+    # Copy in chunks, checking the type and size as the bytes arrive; file and
+    # database writes block, so keep them off the event loop
+    try:
+        path, digest = await run_in_threadpool(stage_upload, image.file, settings.MAX_UPLOAD_BYTES)
+    except UploadRejectedError as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e))
+    slider = await run_in_threadpool(create_pending_slider_image, db, title, description, path, digest)
+    upload_worker.enqueue(slider.id)
+    return slider
 
-@router.post("/admin/slider", response_model=SliderImageOut)
+@router.post("/admin/slider", response_model=SliderImageOut, status_code=status.HTTP_202_ACCEPTED)
 async def create_slider_image(
     title: str = Form(...),
     description: str = Form(...),
     image: UploadFile = File(...),
     db: Session = Depends(get_db)
 ):
-    # Validate file type and size
-    if image.content_type not in ["image/jpeg", "image/png"]:
-        raise HTTPException(status_code=400, detail="Only JPG and PNG images are allowed.")
-    contents = await image.read()
-    if len(contents) > 5 * 1024 * 1024:
-        raise HTTPException(status_code=400, detail="Image size must be less than 5MB.")
-
-    # Upload to Cloudinary
-    image_url = upload_image_to_cloudinary(contents)
-    
-    # Check if upload was successful
-    if not image_url:
-        raise HTTPException(
-            status_code=500, 
-            detail="Failed to upload image. Please check your Cloudinary configuration."
-        )
+    return await accept_slider_upload(title, description, image, db)
 
-    # Store in DB
-    slider = SliderImage(title=title, description=description, image_url=image_url)
-    db.add(slider)
-    db.commit()
-    db.refresh(slider)
-    return slider
-
-@router.post("/slider-images", response_model=SliderImageOut)
+@router.post("/slider-images", response_model=SliderImageOut, status_code=status.HTTP_202_ACCEPTED)
 async def create_slider_image_alt(
     title: str = Form(...),
     description: str = Form(...),
     image: UploadFile = File(...),
     db: Session = Depends(get_db)
 ):
-    # Validate file type and size
-    if image.content_type not in ["image/jpeg", "image/png"]:
-        raise HTTPException(status_code=400, detail="Only JPG and PNG images are allowed.")
-    contents = await image.read()
-    if len(contents) > 5 * 1024 * 1024:
-        raise HTTPException(status_code=400, detail="Image size must be less than 5MB.")
-
-    # Upload to Cloudinary
-    image_url = upload_image_to_cloudinary(contents)
-    
-    # Check if upload was successful
-    if not image_url:
-        raise HTTPException(
-            status_code=500, 
-            detail="Failed to upload image. Please check your Cloudinary configuration."
-        )
-
-    # Store in DB
-    slider = SliderImage(title=title, description=description, image_url=image_url)
-    db.add(slider)
-    db.commit()
-    db.refresh(slider)
-    return slider
+    return await accept_slider_upload(title, description, image, db)
 
 @router.put("/slider-images/{image_id}", response_model=SliderImageOut)
 def update_slider_image_route(
@@ -277,6 +395,7 @@ def update_slider_image_route(
     
     db.commit()
     db.refresh(slider)
+    response_cache.bump(CACHE_SLIDER)
     return slider
 
 @router.delete("/slider-images/{image_id}")
@@ -291,6 +410,7 @@ def delete_slider_image_route(
     
     db.delete(slider)
     db.commit()
+    response_cache.bump(CACHE_SLIDER)
     return {"detail": "Slider image deleted successfully"}
 
 @router.post("/contact-us")
@@ -308,7 +428,7 @@ def contact_us(message: ContactMessageIn, db: Session = Depends(get_db)):
     return {"detail": "تم استلام رسالتك بنجاح!"}
 
 @router.get("/contact-messages", response_model=list[ContactMessageOut])
-def get_contact_messages(db: Session = Depends(get_db), current_user: User = Depends(verify_admin)):
+def get_contact_messages(db: Session = Depends(get_read_db), current_user: User = Depends(verify_admin)):
     messages = db.query(ContactMessageModel).order_by(ContactMessageModel.created_at.desc()).all()
     return messages
 
@@ -319,6 +439,16 @@ def update_user_endpoint(user_id: int, user_update: UserUpdate, db: Session = De
         raise HTTPException(status_code=404, detail="User not found")
     return UserOut.from_orm(user)
 
+@router.post("/users/batch")
+def batch_update_users_endpoint(batch: UserBatchUpdate, db: Session = Depends(get_db), current_user: User = Depends(verify_admin)):
+    """
+    Apply the same role, gender or age to many users in a single statement.
+    """
+    if batch.role is not None and batch.role not in (ROLE_ADMIN, ROLE_PATIENT):
+        raise HTTPException(status_code=400, detail=f"Unknown role '{batch.role}'")
+    updated = batch_update_users(db, batch.ids, batch.dict(exclude={"ids"}))
+    return {"updated": updated}
+
 @router.delete("/users/{user_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_user_endpoint(user_id: int, db: Session = Depends(get_db), current_user: User = Depends(verify_admin)):
     success = crud_delete_user(db, user_id)
@@ -3,28 +3,28 @@ Authentication routes for registration and login.
 """
 
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from ..schemas.user import UserRegister, UserLogin, AdminLogin, UserOut
-from ..crud.user import create_patient_user, authenticate_user, create_default_admin, get_user_by_email
-from ..core.database import get_db
-from ..auth.jwt import create_access_token
-from ..auth.security import verify_password
+from ..crud.aio.user import create_patient_user, authenticate_user, create_default_admin, get_user_by_email
+from ..core.database import get_async_db
+from ..auth.jwt import create_user_access_token
+from ..auth.security import averify_password
 from ..auth.dependencies import get_current_user
 from ..models.user import User
 
 router = APIRouter(prefix="", tags=["auth"])
 
 @router.post("/register", response_model=UserOut, status_code=status.HTTP_201_CREATED)
-def register_patient(user_in: UserRegister, db: Session = Depends(get_db)):
+async def register_patient(user_in: UserRegister, db: AsyncSession = Depends(get_async_db)):
     """
     Register a new patient user. Returns user info and JWT token.
     """
     try:
-        user = create_patient_user(db, user_in.name, user_in.email, user_in.phone_number, user_in.age, user_in.gender, user_in.password)
+        user = await create_patient_user(db, user_in.name, user_in.email, user_in.phone_number, user_in.age, user_in.gender, user_in.password)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     # Create JWT token
-    access_token = create_access_token({"sub": str(user.id), "role": user.role})
+    access_token = create_user_access_token(user)
     return {
         "id": user.id, 
         "name": user.name, 
@@ -37,11 +37,11 @@ def register_patient(user_in: UserRegister, db: Session = Depends(get_db)):
     }
 
 @router.post("/login", response_model=UserOut)
-def login_user(user_in: UserLogin, db: Session = Depends(get_db)):
+async def login_user(user_in: UserLogin, db: AsyncSession = Depends(get_async_db)):
     """
     Login a user with email and password. Returns user info and JWT token.
     """
-    user = authenticate_user(db, user_in.email, user_in.password)
+    user = await authenticate_user(db, user_in.email, user_in.password)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -49,7 +49,7 @@ def login_user(user_in: UserLogin, db: Session = Depends(get_db)):
             headers={"WWW-Authenticate": "Bearer"},
         )
     # Create JWT token
-    access_token = create_access_token({"sub": str(user.id), "role": user.role})
+    access_token = create_user_access_token(user)
     return {
         "id": user.id, 
         "name": user.name, 
@@ -62,15 +62,15 @@ def login_user(user_in: UserLogin, db: Session = Depends(get_db)):
     }
 
 @router.post("/admin-login", response_model=UserOut)
-def login_admin(admin_in: AdminLogin, db: Session = Depends(get_db)):
+async def login_admin(admin_in: AdminLogin, db: AsyncSession = Depends(get_async_db)):
     """
     Login an admin with email and password. Returns admin info and JWT token.
     """
     # Ensure default admin exists
-    create_default_admin(db)
+    await create_default_admin(db)
     
     # Find admin by email
-    admin = db.query(User).filter(User.email == admin_in.email, User.role == "admin").first()
+    admin = await get_user_by_email(db, admin_in.email, role="admin")
     if not admin:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -79,7 +79,7 @@ def login_admin(admin_in: AdminLogin, db: Session = Depends(get_db)):
         )
     
     # Verify password
-    if not verify_password(admin_in.password, admin.hashed_password):
+    if not await averify_password(admin_in.password, admin.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid admin credentials",
@@ -87,7 +87,7 @@ def login_admin(admin_in: AdminLogin, db: Session = Depends(get_db)):
         )
     
     # Create JWT token
-    access_token = create_access_token({"sub": str(admin.id), "role": admin.role})
+    access_token = create_user_access_token(admin)
     return {
         "id": admin.id, 
         "name": admin.name, 
@@ -100,7 +100,7 @@ def login_admin(admin_in: AdminLogin, db: Session = Depends(get_db)):
     }
 
 @router.get("/me", response_model=UserOut)
-def get_current_user_info(current_user: User = Depends(get_current_user)):
+async def get_current_user_info(current_user: User = Depends(get_current_user)):
     """
     Get current user information using JWT token.
     """
@@ -2,20 +2,22 @@
 Availability routes for doctor to manage available time slots.
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
-from datetime import datetime, timedelta
+from datetime import datetime
 from ..schemas.availability import AvailabilityCreate, AvailabilityOut
-from ..crud.availability import create_availability, get_all_availability, get_availability_by_weekday, delete_availability
-from ..core.database import get_db
+from ..crud.aio.availability import create_availability, get_all_availability, get_availability_by_weekday, delete_availability
+from ..core.database import get_async_db, get_async_read_db
 from ..auth.dependencies import get_current_user
 from ..models.user import User
-from ..crud.booking import get_bookings_by_date
+from ..crud.aio.slot import get_free_slots
+from ..core.slot_engine import format_12h
+from ..core.response_cache import acached_list_slice, CACHE_AVAILABILITY
 
 router = APIRouter(prefix="/availability", tags=["availability"])
 
-def verify_admin_access(current_user: User = Depends(get_current_user)):
+async def verify_admin_access(current_user: User = Depends(get_current_user)):
     if current_user.role != "admin":
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -24,12 +26,12 @@ def verify_admin_access(current_user: User = Depends(get_current_user)):
     return current_user
 
 @router.post("/", response_model=AvailabilityOut, status_code=status.HTTP_201_CREATED)
-def create_availability_slot(
+async def create_availability_slot(
     availability: AvailabilityCreate, 
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(verify_admin_access)
 ):
-    db_availability = create_availability(db, availability)
+    db_availability = await create_availability(db, availability)
     return {
         "id": db_availability.id,
         "weekday": db_availability.weekday,
@@ -39,13 +41,8 @@ def create_availability_slot(
         "created_at": db_availability.created_at
     }
 
-@router.get("/", response_model=List[AvailabilityOut])
-def get_availability_slots(
-    skip: int = Query(0, ge=0),
-    limit: int = Query(100, ge=1, le=1000),
-    db: Session = Depends(get_db),
-):
-    availabilities = get_all_availability(db, skip=skip, limit=limit)
+async def render_availability(db: AsyncSession) -> list[dict]:
+    availabilities = await get_all_availability(db, limit=None)
     return [
         {
             "id": availability.id,
@@ -58,13 +55,23 @@ def get_availability_slots(
         for availability in availabilities
     ]
 
+@router.get("/", response_model=List[AvailabilityOut])
+async def get_availability_slots(
+    request: Request,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    db: AsyncSession = Depends(get_async_db),
+):
+    # The whole list is cached once; each (skip, limit) is a slice of it
+    return await acached_list_slice(request, CACHE_AVAILABILITY, "all", lambda: render_availability(db), skip, skip + limit)
+
 @router.get("/by-weekday/{weekday}", response_model=List[AvailabilityOut])
-def get_availability_by_weekday_route(
+async def get_availability_by_weekday_route(
     weekday: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_read_db),
     current_user: User = Depends(verify_admin_access)
 ):
-    availabilities = get_availability_by_weekday(db, weekday)
+    availabilities = await get_availability_by_weekday(db, weekday)
     return [
         {
             "id": availability.id,
@@ -78,12 +85,12 @@ def get_availability_by_weekday_route(
     ]
 
 @router.delete("/{slot_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_availability_slot(
+async def delete_availability_slot(
     slot_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(verify_admin_access)
 ):
-    success = delete_availability(db, slot_id)
+    success = await delete_availability(db, slot_id)
     if not success:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -91,33 +98,19 @@ def delete_availability_slot(
         ) 
 
 @router.get("/available-slots", response_model=List[str], tags=["public"])
-def get_available_slots(
+async def get_available_slots(
     date: str = Query(..., description="Date in YYYY-MM-DD format"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
-    Get available 30-min slots for a specific date (public/patient endpoint).
-    - Converts date to weekday (title case)
-    - Fetches all availability for that weekday
-    - Dynamically splits into 30-min slots
+    Get available slots for a specific date (public/patient endpoint).
+    - Reads the free slots of that date from the slot inventory
     """
     try:
         target_date = datetime.strptime(date, "%Y-%m-%d").date()
     except ValueError:
         raise HTTPException(status_code=400, detail="Invalid date format. Use YYYY-MM-DD.")
-    weekday = target_date.strftime("%A")  # Always title case
-    availabilities = get_availability_by_weekday(db, weekday)
-    # Get all booked slots for this date
-    booked = get_bookings_by_date(db, target_date)
-    booked_slots = set((b.start_time, b.end_time) for b in booked)
-    slots = []
-    for availability in availabilities:
-        start = datetime.combine(target_date, availability.start_time)
-        end = datetime.combine(target_date, availability.end_time)
-        while start + timedelta(minutes=30) <= end:
-            slot_tuple = (start.time(), (start + timedelta(minutes=30)).time())
-            if slot_tuple not in booked_slots:
-                slot_str = f"{start.strftime('%I:%M %p')} - {(start + timedelta(minutes=30)).strftime('%I:%M %p')}"
-                slots.append(slot_str)
-            start += timedelta(minutes=30)
-    return slots 
\ No newline at end of file
+    return [
+        f"{format_12h(start)} - {format_12h(end)}"
+        for start, end in await get_free_slots(db, target_date)
+    ]
@@ -1,20 +1,26 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, status, Query
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 from ..schemas.booking import BookingCreate, BookingOut
-from ..crud.booking import create_booking, get_bookings_by_user, delete_booking, check_slot_booked, get_bookings_by_status
-from ..crud.availability import get_availability_by_weekday, generate_booking_slots
-from ..core.database import get_db
+from ..crud.booking import SlotAlreadyBookedError
+from ..crud.aio.booking import create_booking, get_bookings_by_user, delete_booking, get_bookings_by_status
+from ..crud.aio.availability import load_schedule
+from ..core.slot_engine import MINUTES_PER_DAY, format_12h, format_24h, to_minutes, parse_hhmm
+from ..crud.aio.slot import get_free_slots, get_slots_for_date, next_free_slots, get_calendar
+from ..core.database import get_async_db, get_async_read_db
+from ..core.config import settings
+from ..core.fast_json import list_response
 from ..auth.dependencies import get_current_user
 from ..models.user import User
-from ..models.booking import Booking
+from ..models.slot import SLOT_FREE
 from ..schemas.availability import AvailabilityCreate
-from ..schemas.user import UserOut
-from datetime import date, datetime, timedelta
+from datetime import date, datetime
 
 router = APIRouter(prefix="/bookings", tags=["bookings"])
 
-def verify_patient_access(current_user: User = Depends(get_current_user)):
+MAX_CALENDAR_DAYS = 90
+
+async def verify_patient_access(current_user: User = Depends(get_current_user)):
     if current_user.role != "patient":
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -23,94 +29,62 @@ def verify_patient_access(current_user: User = Depends(get_current_user)):
     return current_user
 
 @router.post("/", response_model=BookingOut, status_code=status.HTTP_201_CREATED)
-def book_slot(
+async def book_slot(
     booking: BookingCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(verify_patient_access)
 ):
     # Parse and normalize times
     start_time = AvailabilityCreate.parse_time_string(booking.start_time)
     end_time = AvailabilityCreate.parse_time_string(booking.end_time)
-    # Enforce 30-minute slot duration
-    slot_duration = (
-        datetime.combine(booking.date, end_time) - datetime.combine(booking.date, start_time)
-    )
-    if slot_duration != timedelta(minutes=30):
-        raise HTTPException(status_code=400, detail="You can only book 30-minute slots.")
-    # Check if slot is already booked
-    if check_slot_booked(db, booking.date, start_time, end_time):
-        raise HTTPException(status_code=409, detail="Slot already booked")
-    # Check if slot is within any defined availability for that weekday (robust logic)
-    weekday = booking.date.strftime("%A")
-    availabilities = get_availability_by_weekday(db, weekday)
-    slot_is_valid = any(
-        avail.start_time <= start_time and avail.end_time >= end_time
-        for avail in availabilities
-    )
-    if not slot_is_valid:
-        raise HTTPException(status_code=400, detail="This slot is not available for booking.")
-    db_booking = create_booking(db, int(current_user.id), booking)
-    return BookingOut(
-        id=db_booking.id,
-        user=UserOut.from_orm(db_booking.user),
-        date=db_booking.date,
-        start_time=db_booking.start_time.strftime('%I:%M %p'),
-        end_time=db_booking.end_time.strftime('%I:%M %p'),
-        status=db_booking.status,
-        created_at=db_booking.created_at
-    )
+    # The booking must start on a slot and span whole slots within working hours
+    schedule = await load_schedule(db)
+    if not schedule.is_bookable(booking.date, to_minutes(start_time), to_minutes(end_time), settings.MAX_BOOKING_SLOTS):
+        raise HTTPException(
+            status_code=400,
+            detail=(
+                "This slot is not available for booking. Bookings start on a slot and last "
+                f"1 to {settings.MAX_BOOKING_SLOTS} slots of {schedule.slot_minutes} minutes."
+            )
+        )
+    # Conflicts are detected by the write itself, no separate existence check
+    try:
+        db_booking = await create_booking(db, int(current_user.id), booking)
+    except SlotAlreadyBookedError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    return BookingOut.from_booking(db_booking)
 
 @router.get("/my-bookings", response_model=List[BookingOut])
-def get_my_bookings(
-    db: Session = Depends(get_db),
+async def get_my_bookings(
+    db: AsyncSession = Depends(get_async_read_db),
     current_user: User = Depends(verify_patient_access)
 ):
-    bookings = get_bookings_by_user(db, int(current_user.id))
-    return [
-        BookingOut(
-            id=b.id,
-            user=UserOut.from_orm(b.user),
-            date=b.date,
-            start_time=b.start_time.strftime('%I:%M %p'),
-            end_time=b.end_time.strftime('%I:%M %p'),
-            status=b.status,
-            created_at=b.created_at
-        ) for b in bookings
-    ]
+    bookings = await get_bookings_by_user(db, int(current_user.id))
+    return list_response(bookings, BookingOut.row, BookingOut.from_booking)
 
 @router.delete("/{booking_id}", status_code=status.HTTP_204_NO_CONTENT)
-def cancel_booking(
+async def cancel_booking(
     booking_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(verify_patient_access)
 ):
-    success = delete_booking(db, booking_id, int(current_user.id))
+    success = await delete_booking(db, booking_id, int(current_user.id))
     if not success:
         raise HTTPException(status_code=404, detail="Booking not found or not yours")
 
 @router.get("/by-status/{status}", response_model=List[BookingOut])
-def get_bookings_by_status_endpoint(
+async def get_bookings_by_status_endpoint(
     status: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_read_db),
     current_user: User = Depends(verify_patient_access)
 ):
-    bookings = get_bookings_by_status(db, status)
-    return [
-        BookingOut(
-            id=b.id,
-            user=UserOut.from_orm(b.user),
-            date=b.date,
-            start_time=b.start_time.strftime('%I:%M %p'),
-            end_time=b.end_time.strftime('%I:%M %p'),
-            status=b.status,
-            created_at=b.created_at
-        ) for b in bookings
-    ]
+    bookings = await get_bookings_by_status(db, status)
+    return list_response(bookings, BookingOut.row, BookingOut.from_booking)
 
 @router.get("/available-slots/{date}")
-def get_available_slots(
+async def get_available_slots(
     date: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(verify_patient_access)
 ):
     """
@@ -118,32 +92,18 @@ def get_available_slots(
     """
     try:
         # Validate date format
-        datetime.strptime(date, '%Y-%m-%d')
+        target_date = datetime.strptime(date, '%Y-%m-%d').date()
     except ValueError:
         raise HTTPException(status_code=400, detail="Invalid date format. Use YYYY-MM-DD")
     
-    # Generate slots based on booking settings
-    slots = generate_booking_slots(db, date)
-    
-    # Filter out already booked slots
-    booked_slots = db.query(Booking).filter(
-        Booking.date == date,
-        Booking.status.in_(["confirmed", "pending"])
-    ).all()
-    
-    # Create a set of booked time ranges for quick lookup
-    booked_times = set()
-    for booking in booked_slots:
-        start_str = booking.start_time.strftime('%H:%M')
-        end_str = booking.end_time.strftime('%H:%M')
-        booked_times.add(f"{start_str}-{end_str}")
-    
-    # Mark slots as unavailable if they overlap with booked times
-    available_slots = []
-    for slot in slots:
-        slot_key = f"{slot['start_time']}-{slot['end_time']}"
-        if slot_key not in booked_times:
-            available_slots.append(slot)
+    available_slots = [
+        {
+            'start_time': format_24h(start),
+            'end_time': format_24h(end),
+            'available': True
+        }
+        for start, end in await get_free_slots(db, target_date)
+    ]
     
     return {
         "date": date,
@@ -151,79 +111,122 @@ def get_available_slots(
     }
 
 @router.get("/available-slots-public/{date}")
-def get_available_slots_public(
+async def get_available_slots_public(
     date: str,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get available booking slots for a specific date (public endpoint, no auth required).
     """
     try:
         # Validate date format
-        datetime.strptime(date, '%Y-%m-%d')
+        target_date = datetime.strptime(date, '%Y-%m-%d').date()
     except ValueError:
         raise HTTPException(status_code=400, detail="Invalid date format. Use YYYY-MM-DD")
     
-    # Get day name from date
-    date_obj = datetime.strptime(date, '%Y-%m-%d')
-    weekday = date_obj.strftime('%A')
-    
-    # Get availability for this weekday
-    availabilities = get_availability_by_weekday(db, weekday)
-    if not availabilities:
+    # One indexed range scan over the slot inventory
+    slots = await get_slots_for_date(db, target_date)
+    if not slots:
         return {
             "date": date,
             "slots": [],
             "message": "No availability for this day"
         }
     
-    # Generate 30-minute slots for each availability range
-    all_slots = []
-    for avail in availabilities:
-        start_time = avail.start_time
-        end_time = avail.end_time
-        
-        # Generate slots every 30 minutes
-        current_time = datetime.combine(date_obj, start_time)
-        end_datetime = datetime.combine(date_obj, end_time)
-        
-        while current_time + timedelta(minutes=30) <= end_datetime:
-            slot_start = current_time.time()
-            slot_end = (current_time + timedelta(minutes=30)).time()
-            
-            all_slots.append({
-                'start_time': slot_start.strftime('%I:%M %p'),
-                'end_time': slot_end.strftime('%I:%M %p'),
-                'start_time_24h': slot_start.strftime('%H:%M'),
-                'end_time_24h': slot_end.strftime('%H:%M')
-            })
-            
-            current_time += timedelta(minutes=30)
-    
-    # Filter out already booked slots
-    booked_slots = db.query(Booking).filter(
-        Booking.date == date,
-        Booking.status.in_(["booked", "confirmed", "pending"])
-    ).all()
-    
-    # Create a set of booked time ranges for quick lookup
-    booked_times = set()
-    for booking in booked_slots:
-        start_str = booking.start_time.strftime('%H:%M')
-        end_str = booking.end_time.strftime('%H:%M')
-        booked_times.add(f"{start_str}-{end_str}")
-    
-    # Filter out booked slots
-    available_slots = []
-    for slot in all_slots:
-        slot_key = f"{slot['start_time_24h']}-{slot['end_time_24h']}"
-        if slot_key not in booked_times:
-            available_slots.append({
-                'start_time': slot['start_time'],
-                'end_time': slot['end_time']
-            })
+    available_slots = [
+        {
+            'start_time': format_12h(start),
+            'end_time': format_12h(end)
+        }
+        for start, end, state in slots
+        if state == SLOT_FREE
+    ]
     
     return {
         "date": date,
         "slots": available_slots
-    } 
\ No newline at end of file
+    }
+
+@router.get("/next-available")
+async def get_next_available_slots(
+    from_date: str | None = Query(None, description="First date to search, YYYY-MM-DD (default: today)"),
+    count: int = Query(5, ge=1, le=50),
+    after: str | None = Query(None, description="Earliest start time, HH:MM (24-hour)"),
+    before: str | None = Query(None, description="Latest end time, HH:MM (24-hour)"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Get the earliest free slots from a date on (public endpoint, no auth required),
+    optionally restricted to a time-of-day window.
+    """
+    now = datetime.now()
+    try:
+        start_date = datetime.strptime(from_date, '%Y-%m-%d').date() if from_date else now.date()
+        window_start = parse_hhmm(after) if after else 0
+        window_end = parse_hhmm(before) if before else MINUTES_PER_DAY
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid date or time format. Use YYYY-MM-DD and HH:MM")
+    # Slots of today that already started cannot be booked anymore
+    if start_date <= now.date():
+        start_date, not_before = now.date(), now.hour * 60 + now.minute
+    else:
+        not_before = 0
+
+    slots = await next_free_slots(db, start_date, count, window_start, window_end, not_before)
+    return {
+        "from_date": start_date.isoformat(),
+        "slots": [
+            {
+                'date': slot_date.isoformat(),
+                'start_time': format_12h(start),
+                'end_time': format_12h(end)
+            }
+            for slot_date, start, end in slots
+        ]
+    }
+
+@router.get("/calendar")
+async def get_calendar_availability(
+    from_date: str = Query(..., alias="from", description="First date, YYYY-MM-DD"),
+    to_date: str = Query(..., alias="to", description="Last date (inclusive), YYYY-MM-DD"),
+    include_slots: bool = Query(False, description="Also list every slot of each day"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Get a per-day availability summary for a date range (public endpoint, no auth required).
+    """
+    try:
+        start_date = datetime.strptime(from_date, '%Y-%m-%d').date()
+        end_date = datetime.strptime(to_date, '%Y-%m-%d').date()
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid date format. Use YYYY-MM-DD")
+    if end_date < start_date:
+        raise HTTPException(status_code=400, detail="'to' must not be before 'from'")
+    if (end_date - start_date).days >= MAX_CALENDAR_DAYS:
+        raise HTTPException(status_code=400, detail=f"The range can span at most {MAX_CALENDAR_DAYS} days")
+
+    schedule, masks = await get_calendar(db, start_date, end_date)
+    days = []
+    for day, mask in sorted(masks.items()):
+        template = schedule.day_slots(day)
+        summary = {
+            'date': day.isoformat(),
+            'total_slots': len(template),
+            'free_slots': len(template) - mask.bit_count()
+        }
+        if include_slots:
+            summary['slots'] = [
+                {
+                    'start_time': format_12h(start),
+                    'end_time': format_12h(end),
+                    'available': not mask >> bit & 1
+                }
+                for bit, (start, end) in enumerate(template)
+            ]
+        days.append(summary)
+    return {
+        "from": start_date.isoformat(),
+        "to": end_date.isoformat(),
+        "slot_minutes": schedule.slot_minutes,
+        "days": days
+    }
@@ -1,22 +1,27 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request
 from sqlalchemy.orm import Session
 from typing import List
 from ..core.database import get_db
+from ..core.response_cache import cached_response, CACHE_SLIDER, PRIVATE_CACHE_CONTROL
 from ..schemas.slider_image import SliderImageOut
 from ..crud.slider_image import get_slider_images
 
 router = APIRouter(prefix="/slider", tags=["slider"])
 
+def render_slider_images(db: Session, ready_only: bool = False) -> list[SliderImageOut]:
+    return [SliderImageOut.from_orm(image) for image in get_slider_images(db, ready_only)]
+
 @router.get("/images", response_model=List[SliderImageOut])
-def get_slider_images_public_endpoint(db: Session = Depends(get_db)):
+def get_slider_images_public_endpoint(request: Request, db: Session = Depends(get_db)):
     """
     Endpoint عام لجلب صور السلايدر (بدون تحقق أدمن)
     """
-    return get_slider_images(db)
+    # Only completed uploads; pending and failed ones are listed to admins
+    return cached_response(request, CACHE_SLIDER, "ready", lambda: render_slider_images(db, ready_only=True))
 
 @router.get("/admin/slider-images", response_model=List[SliderImageOut])
-def get_slider_images_admin_endpoint(db: Session = Depends(get_db)):
+def get_slider_images_admin_endpoint(request: Request, db: Session = Depends(get_db)):
     """
     Endpoint لإدارة السلايدر (admin) لجلب صور السلايدر
     """
-    return get_slider_images(db) 
\ No newline at end of file
+    return cached_response(request, CACHE_SLIDER, "ordered", lambda: render_slider_images(db), PRIVATE_CACHE_CONTROL)
@@ -58,6 +58,7 @@ class BookingSettings(BookingSettingsBase):
 
     class Config:
         from_attributes = True
+        orm_mode = True
 
 class AvailabilityOut(BaseModel):
     """
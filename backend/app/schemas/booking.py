@@ -1,6 +1,6 @@
 from pydantic import BaseModel
 import datetime
-from typing import Optional
+from typing import List, Optional
 from .user import UserOut
 
 class BookingBase(BaseModel):
@@ -18,6 +18,15 @@ class BookingUpdate(BaseModel):
     end_time: Optional[str] = None    # Format: "HH:MM AM/PM"
     status: Optional[str] = None
 
+class BookingBatchFilter(BaseModel):
+    ids: Optional[List[int]] = None
+    date_from: Optional[datetime.date] = None
+    date_to: Optional[datetime.date] = None
+    status: Optional[str] = None  # Current status of the bookings to select
+
+class BookingBatchStatus(BookingBatchFilter):
+    set_status: str
+
 class BookingOut(BaseModel):
     id: int
     user: UserOut
@@ -28,4 +37,45 @@ class BookingOut(BaseModel):
     created_at: datetime.datetime
 
     class Config:
-        from_attributes = True 
\ No newline at end of file
+        from_attributes = True
+        orm_mode = True
+
+    @classmethod
+    def from_booking(cls, booking) -> "BookingOut":
+        """
+        Build the response for a Booking row whose user is already loaded.
+        """
+        return cls(
+            id=booking.id,
+            user=UserOut.from_orm(booking.user),
+            date=booking.date,
+            start_time=booking.start_time.strftime('%I:%M %p'),
+            end_time=booking.end_time.strftime('%I:%M %p'),
+            status=booking.status,
+            created_at=booking.created_at
+        )
+
+    @classmethod
+    def row(cls, booking) -> dict:
+        """
+        Plain dict in this schema's shape, for fast_json_response.
+        """
+        return {
+            "id": booking.id,
+            "user": UserOut.row(booking.user),
+            "date": booking.date,
+            "start_time": booking.start_time.strftime('%I:%M %p'),
+            "end_time": booking.end_time.strftime('%I:%M %p'),
+            "status": booking.status,
+            "created_at": booking.created_at,
+        }
+
+class BookingPage(BaseModel):
+    """
+    One page of the admin booking list.
+    Fields:
+        items: Bookings of the page, ordered by date, start time and id
+        next_cursor: Opaque cursor of the next page, None on the last page
+    """
+    items: List[BookingOut]
+    next_cursor: Optional[str] = None
@@ -14,4 +14,5 @@ class ClinicInfoOut(BaseModel):
     address: str
 
     class Config:
-        from_attributes = True 
\ No newline at end of file
+        from_attributes = True
+        orm_mode = True 
\ No newline at end of file
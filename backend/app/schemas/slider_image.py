@@ -25,6 +25,10 @@ class SliderImageOut(BaseModel):
     order: int
     created_at: Optional[datetime] = None
     updated_at: Optional[datetime] = None
+    upload_status: str = "ready"
+    srcset: Optional[str] = None
+    srcset_jpeg: Optional[str] = None
 
     class Config:
-        from_attributes = True 
\ No newline at end of file
+        from_attributes = True
+        orm_mode = True 
\ No newline at end of file
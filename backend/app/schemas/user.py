@@ -1,5 +1,5 @@
 from pydantic import BaseModel, EmailStr, Field
-from typing import Optional
+from typing import List, Optional
 
 class UserRegister(BaseModel):
     """
@@ -63,6 +63,33 @@ class UserOut(BaseModel):
 
     class Config:
         from_attributes = True
+        orm_mode = True
+
+    @classmethod
+    def row(cls, user) -> dict:
+        """
+        Plain dict in this schema's shape, for fast_json_response.
+        """
+        return {
+            "id": user.id,
+            "name": user.name,
+            "email": user.email,
+            "phone_number": user.phone_number,
+            "age": user.age,
+            "gender": user.gender,
+            "role": user.role,
+            "access_token": None,
+        }
+
+class UserPage(BaseModel):
+    """
+    One page of the admin user list.
+    Fields:
+        items: Users of the page, ordered by id
+        next_cursor: Opaque cursor of the next page, None on the last page
+    """
+    items: List[UserOut]
+    next_cursor: Optional[str] = None
 
 class UserUpdate(BaseModel):
     name: Optional[str] = None
@@ -71,4 +98,10 @@ class UserUpdate(BaseModel):
     age: Optional[int] = None
     gender: Optional[str] = None
     role: Optional[str] = None
-    status: Optional[str] = None 
\ No newline at end of file
+    status: Optional[str] = None
+
+class UserBatchUpdate(BaseModel):
+    ids: List[int]
+    role: Optional[str] = None
+    gender: Optional[str] = None
+    age: Optional[int] = Field(None, gt=0, le=120)
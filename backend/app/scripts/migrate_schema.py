@@ -0,0 +1,50 @@
+"""
+Apply schema changes that `Base.metadata.create_all` cannot make on an
+existing database (new indexes and columns on tables that already exist).
+Every statement is idempotent, so the script is safe to run repeatedly.
+
+Usage: python -m app.scripts.migrate_schema
+"""
+
+from sqlalchemy import text
+from ..core.database import engine
+from ..models.user import SEARCH_INDEX_DDL
+from ..models.booking import BOOKING_OVERLAP_DDL
+
+STATEMENTS = [
+    # Partial unique index backing the race-free booking insert
+    """
+    CREATE UNIQUE INDEX IF NOT EXISTS uq_bookings_active_slot
+    ON bookings (date, start_time)
+    WHERE status IN ('booked', 'confirmed', 'pending')
+    """,
+    # Overlapping active bookings are rejected by the database
+    BOOKING_OVERLAP_DDL,
+    # Keyset pagination of the admin booking list
+    """
+    CREATE INDEX IF NOT EXISTS ix_bookings_date_start_time_id
+    ON bookings (date, start_time, id)
+    """,
+    # Version claim used to detect stale cached users
+    "ALTER TABLE users ADD COLUMN IF NOT EXISTS token_version INTEGER NOT NULL DEFAULT 0",
+    # Background slider image uploads
+    "ALTER TABLE slider_images ADD COLUMN IF NOT EXISTS upload_status VARCHAR NOT NULL DEFAULT 'ready'",
+    "ALTER TABLE slider_images ADD COLUMN IF NOT EXISTS upload_attempts INTEGER NOT NULL DEFAULT 0",
+    "ALTER TABLE slider_images ADD COLUMN IF NOT EXISTS upload_error VARCHAR",
+    "ALTER TABLE slider_images ADD COLUMN IF NOT EXISTS upload_path VARCHAR",
+    "ALTER TABLE slider_images ADD COLUMN IF NOT EXISTS content_hash VARCHAR",
+    "ALTER TABLE slider_images ADD COLUMN IF NOT EXISTS srcset VARCHAR",
+    "ALTER TABLE slider_images ADD COLUMN IF NOT EXISTS srcset_jpeg VARCHAR",
+    # Indexed patient search
+    *SEARCH_INDEX_DDL,
+]
+
+def migrate():
+    with engine.connect() as connection:
+        for statement in STATEMENTS:
+            connection.execute(text(statement))
+        connection.commit()
+    print('Schema is up to date.')
+
+if __name__ == '__main__':
+    migrate()
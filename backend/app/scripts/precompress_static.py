@@ -0,0 +1,69 @@
+"""
+Write brotli and gzip variants of the compressible static files, for
+CachedStaticFiles to serve without compressing per request. Variants that
+are not at least MIN_SAVING smaller than the original are skipped, and up to
+date ones are kept, so the script is safe to run repeatedly (the Docker
+build runs it after copying in the Angular build). Brotli needs the optional
+`brotli` package; without it only gzip variants are written.
+
+Usage: python -m app.scripts.precompress_static [directory]
+"""
+
+import gzip
+import os
+import sys
+from ..core.static_files import COMPRESSIBLE_EXTENSIONS
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+MIN_SIZE = 1024
+MIN_SAVING = 0.1
+
+def _compressors():
+    yield ".gz", lambda data: gzip.compress(data, compresslevel=9, mtime=0)
+    if brotli is not None:
+        yield ".br", lambda data: brotli.compress(data, quality=11)
+
+def precompress_file(path: str) -> int:
+    """
+    Write the missing or outdated compressed variants of one file.
+    Returns:
+        int: Number of variants written
+    """
+    written = 0
+    stat = os.stat(path)
+    if stat.st_size < MIN_SIZE:
+        return 0
+    data = None
+    for suffix, compress in _compressors():
+        target = path + suffix
+        if os.path.exists(target) and os.stat(target).st_mtime >= stat.st_mtime:
+            continue
+        if data is None:
+            with open(path, "rb") as f:
+                data = f.read()
+        compressed = compress(data)
+        if len(compressed) > len(data) * (1 - MIN_SAVING):
+            if os.path.exists(target):
+                os.remove(target)
+            continue
+        with open(target + ".tmp", "wb") as f:
+            f.write(compressed)
+        os.replace(target + ".tmp", target)
+        written += 1
+    return written
+
+def precompress(directory: str = "static") -> int:
+    written = 0
+    for root, _, files in os.walk(directory):
+        for name in files:
+            if os.path.splitext(name)[1].lower() in COMPRESSIBLE_EXTENSIONS:
+                written += precompress_file(os.path.join(root, name))
+    return written
+
+if __name__ == '__main__':
+    count = precompress(sys.argv[1] if len(sys.argv) > 1 else "static")
+    print(f'Wrote {count} compressed variants.' + ('' if brotli else ' (brotli not installed, gzip only)'))
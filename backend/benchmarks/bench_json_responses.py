@@ -0,0 +1,79 @@
+"""
+Compare the validated and the fast JSON path of a large booking list.
+
+Builds 10,000 in-memory bookings shaped like the ORM rows (no database
+needed) and serves them from two routes with the same response_model:
+one returns BookingOut models, which FastAPI validates again and encodes
+with the stdlib json module; the other returns list_response rows encoded
+with orjson. Each route is called through the ASGI stack with TestClient.
+
+Usage (from backend/): python -m benchmarks.bench_json_responses [rows] [repeats]
+"""
+
+import sys
+import time
+from datetime import date, datetime, time as dtime, timedelta
+from types import SimpleNamespace
+from typing import List
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from app.core.config import settings
+from app.core.fast_json import list_response, orjson
+from app.schemas.booking import BookingOut
+
+
+def make_bookings(count: int) -> list:
+    users = [
+        SimpleNamespace(
+            id=i, name=f"Patient {i}", email=f"patient{i}@example.com", phone_number=f"079-555-{i:04d}",
+            age=20 + i % 60, gender="f" if i % 2 else "m", role="patient"
+        )
+        for i in range(1, 501)
+    ]
+    start = date.today()
+    return [
+        SimpleNamespace(
+            id=i, user=users[i % len(users)], date=start + timedelta(days=i // 16),
+            start_time=dtime(9 + (i % 16) // 2, 30 * (i % 2)), end_time=dtime(9 + (i % 16 + 1) // 2, 30 * ((i + 1) % 2)),
+            status="booked", created_at=datetime(2025, 1, 1, 12, 0, 0, 123456) + timedelta(minutes=i)
+        )
+        for i in range(count)
+    ]
+
+def build_app(bookings: list) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/validated", response_model=List[BookingOut])
+    def validated():
+        return [BookingOut.from_booking(b) for b in bookings]
+
+    @app.get("/fast", response_model=List[BookingOut])
+    def fast():
+        return list_response(bookings, BookingOut.row, BookingOut.from_booking)
+
+    return app
+
+def timed(client: TestClient, path: str, repeats: int) -> tuple[float, int]:
+    best, size = float("inf"), 0
+    for _ in range(repeats):
+        started = time.perf_counter()
+        response = client.get(path)
+        best = min(best, time.perf_counter() - started)
+        size = len(response.content)
+    return best, size
+
+def main(rows: int = 10_000, repeats: int = 5) -> None:
+    settings.FAST_JSON_RESPONSES = True
+    bookings = make_bookings(rows)
+    client = TestClient(build_app(bookings))
+    assert client.get("/validated").json() == client.get("/fast").json(), "fast path output differs"
+
+    validated, size = timed(client, "/validated", repeats)
+    fast, _ = timed(client, "/fast", repeats)
+    print(f"{rows} bookings, {size / 1024:.0f} KiB of JSON, best of {repeats} (encoder: {'orjson' if orjson else 'json'})")
+    print(f"  validated response_model path: {validated * 1000:8.1f} ms")
+    print(f"  fast path:                     {fast * 1000:8.1f} ms")
+    print(f"  speedup:                       {validated / fast:8.1f}x")
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:3]))
@@ -11,7 +11,11 @@ import { ClinicService, SliderImage } from '../../services/clinic.service';
   template: `
     <div class="slider-container">
       <div class="slide" *ngFor="let slide of slides; let i = index" [class.active]="i === currentSlide">
-        <div class="slide-background" [style.background-image]="'url(' + getImageUrl(slide.image_url || '') + ')'" ></div>
+        <picture>
+          <source *ngIf="slide.srcset" type="image/webp" [attr.srcset]="getSrcset(slide.srcset)" sizes="100vw">
+          <source *ngIf="slide.srcset_jpeg" type="image/jpeg" [attr.srcset]="getSrcset(slide.srcset_jpeg)" sizes="100vw">
+          <img class="slide-background" [src]="getImageUrl(slide.image_url || '')" alt="" decoding="async">
+        </picture>
         <div class="slide-overlay"></div>
         <div class="slide-content">
           <h2 class="slide-title">{{ slide.title }}</h2>
@@ -73,9 +77,9 @@ import { ClinicService, SliderImage } from '../../services/clinic.service';
       left: 0;
       width: 100%;
       height: 100%;
-      background-size: cover;
-      background-position: center;
-      background-repeat: no-repeat;
+      display: block;
+      object-fit: cover;
+      object-position: center;
     }
     
     .slide-overlay {
@@ -305,4 +309,12 @@ export class SliderComponent implements OnInit {
     if (imageUrl.startsWith('http')) return imageUrl;
     return this.apiUrl + imageUrl;
   }
+
+  // Resolve the API-relative URLs of a srcset ('/static/derived/x-480w.webp 480w, ...')
+  getSrcset(srcset: string): string {
+    return srcset.split(',').map(entry => {
+      const [url, width] = entry.trim().split(/\s+/);
+      return `${this.getImageUrl(url)} ${width}`;
+    }).join(', ');
+  }
 }
@@ -1,13 +1,16 @@
 import { Injectable } from '@angular/core';
 import { HttpClient, HttpHeaders } from '@angular/common/http';
-import { Observable, of } from 'rxjs';
-import { map, delay } from 'rxjs/operators';
+import { EMPTY, Observable, of } from 'rxjs';
+import { map, delay, expand, reduce } from 'rxjs/operators';
 import { Appointment } from '../models/appointment';
 
 export interface SliderImage {
   id: string;
   image?: string;
   image_url: string;
+  // Resized variants as <img srcset> values: WebP, and JPEG as fallback
+  srcset?: string | null;
+  srcset_jpeg?: string | null;
   title: string;
   text: string;
   order: number;
@@ -58,6 +61,15 @@ export interface BookingOut {
   created_at: string;
 }
 
+// One page of a cursor-paginated admin list
+export interface Page<T> {
+  items: T[];
+  next_cursor: string | null;
+}
+
+// Largest page the admin list endpoints serve
+const ADMIN_PAGE_SIZE = 1000;
+
 export interface AvailabilityOut {
   id: number;
   weekday: string;
@@ -84,6 +96,19 @@ export class ClinicService {
     });
   }
 
+  // Admin lists are paginated: follow next_cursor until the last page
+  private getAllPages<T>(url: string, params: Record<string, string> = {}): Observable<T[]> {
+    const fetchPage = (cursor: string | null) =>
+      this.http.get<Page<T>>(url, {
+        headers: this.getAuthHeaders(),
+        params: { ...params, limit: ADMIN_PAGE_SIZE, ...(cursor ? { cursor } : {}) }
+      });
+    return fetchPage(null).pipe(
+      expand(page => page.next_cursor ? fetchPage(page.next_cursor) : EMPTY),
+      reduce((all: T[], page) => all.concat(page.items), [])
+    );
+  }
+
   // Authentication
   login(email: string, password: string): Observable<any> {
     return this.http.post(`${this.apiUrl}/login`, { email, password });
@@ -103,9 +128,7 @@ export class ClinicService {
 
   // Appointments Management
   getAppointments(): Observable<BookingOut[]> {
-    return this.http.get<BookingOut[]>(`${this.apiUrl}/admin/bookings`, { 
-      headers: this.getAuthHeaders() 
-    });
+    return this.getAllPages<BookingOut>(`${this.apiUrl}/admin/bookings`);
   }
 
   createAppointment(booking: BookingCreate): Observable<BookingOut> {
@@ -149,9 +172,7 @@ export class ClinicService {
 
   // User Management
   getUsers(): Observable<User[]> {
-    return this.http.get<User[]>(`${this.apiUrl}/admin/users`, { 
-      headers: this.getAuthHeaders() 
-    });
+    return this.getAllPages<User>(`${this.apiUrl}/admin/users`);
   }
 
   createUser(user: Omit<User, 'id'>): Observable<User> {
@@ -227,8 +248,9 @@ export class ClinicService {
     });
   }
 
+  // Completed uploads only, from the public cached endpoint
   getSliderImagesPublic(): Observable<SliderImage[]> {
-    return this.http.get<SliderImage[]>(`${this.apiUrl}/admin/slider-images`);
+    return this.http.get<SliderImage[]>(`${this.apiUrl}/slider/images`);
   }
 
   addSliderImage(formData: FormData): Observable<SliderImage> {
@@ -257,21 +279,15 @@ export class ClinicService {
 
   // Legacy methods for compatibility (will be removed)
   getAppointmentsByDate(date: string): Observable<BookingOut[]> {
-    return this.http.get<BookingOut[]>(`${this.apiUrl}/admin/bookings?date=${date}`, { 
-      headers: this.getAuthHeaders() 
-    });
+    return this.getAllPages<BookingOut>(`${this.apiUrl}/admin/bookings`, { date });
   }
 
   getAppointmentsByStatus(status: string): Observable<BookingOut[]> {
-    return this.http.get<BookingOut[]>(`${this.apiUrl}/admin/bookings?status=${status}`, { 
-      headers: this.getAuthHeaders() 
-    });
+    return this.getAllPages<BookingOut>(`${this.apiUrl}/admin/bookings`, { status });
   }
 
   getUpcomingAppointments(): Observable<BookingOut[]> {
-    return this.http.get<BookingOut[]>(`${this.apiUrl}/admin/bookings?upcoming=true`, { 
-      headers: this.getAuthHeaders() 
-    });
+    return this.getAllPages<BookingOut>(`${this.apiUrl}/admin/bookings`, { upcoming: 'true' });
   }
 
   getPendingAppointments(): Observable<BookingOut[]> {
@@ -0,0 +1,32 @@
+import { HttpInterceptorFn, HttpResponse } from '@angular/common/http';
+import { tap } from 'rxjs/operators';
+
+// The API answers a write with this header (a unix time) when it reads from a
+// replica; echoing it back until then makes our reads go to the primary, so
+// the dashboard sees its own writes despite replica lag.
+const PRIMARY_PIN_HEADER = 'X-Primary-Pin';
+
+// Latest pin per API origin
+const pins = new Map<string, string>();
+
+function originOf(url: string): string {
+  return new URL(url, window.location.href).origin;
+}
+
+export const primaryPinInterceptor: HttpInterceptorFn = (req, next) => {
+  const origin = originOf(req.url);
+  const pin = pins.get(origin);
+  if (pin && Number(pin) > Date.now() / 1000) {
+    req = req.clone({ setHeaders: { [PRIMARY_PIN_HEADER]: pin } });
+  } else if (pin) {
+    pins.delete(origin);
+  }
+  return next(req).pipe(
+    tap(event => {
+      const newPin = event instanceof HttpResponse ? event.headers.get(PRIMARY_PIN_HEADER) : null;
+      if (newPin) {
+        pins.set(origin, newPin);
+      }
+    })
+  );
+};